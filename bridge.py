@@ -1,31 +1,75 @@
 from vector import Vector
-from sgsm import SGSM
+from polyline import Polyline
+from sgsm import SGSM, SGSMCases
+from lrucache import LRUCache
+from influence import InfluenceLines
+import numpy as np
 import operator as op 
 import math
+import weakref
 
 class Bridge:
 
+    # number of load dependent values each bridge caches (about three 
+    # for each value of q used)
+    loadCacheSize = 12
+
+    # number of InfluenceLines kept for all bridges together, since each
+    # holds dense (segments - 1) x (segments - 1) arrays. The lines are 
+    # kept by weak reference to their bridge.
+    influenceCacheSize = 8
+    _influenceCache = LRUCache(influenceCacheSize)
+
     # creates Bridge object using list of deck coordinates deckCoords
     # and either SGSM object sgsm or list of arch coordinates archCoords
     def __init__(self, sgsm=None, deckCoords=None, archCoords=None):
 
-        if sgsm != None and archCoords != None:
+        if sgsm is not None and archCoords is not None:
             if sgsm.getForm() != archCoords:
                 raise Exception("sgsm and arch are not consistent")
-        if archCoords == None:
+        if archCoords is None:
             form = sgsm.getForm()
         else:
-            form = archCoords
+            form = Polyline(archCoords)
+        deckCoords = Polyline(deckCoords)
 
         if len(form) != len(deckCoords):
             raise Exception("sgsm and deck coords not consistent")
-        for i in range(len(form)):
-            if form[i].x() != deckCoords[i].x():
-                raise Exception("sgsm and deck coords not consistent")
+        if np.any(form.xs() != deckCoords.xs()):
+            raise Exception("sgsm and deck coords not consistent")
 
         self._sgsm = sgsm
         self._deckCoords = deckCoords
         self._archCoords = form
+        self._geometry = {}
+        self._loadCache = None
+
+    # returns read-only array stored with key, found with make() the 
+    # first time. Geometry does not change, so these are kept until 
+    # clearCache.
+    def _geometryValue(self, key, make):
+        if key not in self._geometry:
+            a = np.asarray(make(), dtype=float)
+            a.setflags(write=False)
+            self._geometry[key] = a
+        return self._geometry[key]
+
+    # returns value stored with load dependent key, found with make() 
+    # the first time. At most loadCacheSize loads are kept per bridge.
+    def _loadValue(self, key, make):
+        if self._loadCache is None:
+            self._loadCache = LRUCache(Bridge.loadCacheSize)
+        value = self._loadCache.get(key)
+        if value is None:
+            value = make()
+            self._loadCache.put(key, value)
+        return value
+
+    # drops all cached values of self
+    def clearCache(self):
+        self._geometry = {}
+        self._loadCache = None
+        Bridge._influenceCache.invalidate(lambda key: key() is self)
 
     # returns SGSM object (None if defined with arch coords)
     def getSGSM(self):
@@ -39,20 +83,20 @@ class Bridge:
 
     # returns length (L)
     def getL(self):
-        l = len(self._deckCoords)
-        return self._deckCoords[l-1].x() - self._deckCoords[0].x()
+        xs = self._deckCoords.xs()
+        return xs[-1] - xs[0]
 
-    # returns list arch coordinates
+    # returns Polyline of arch coordinates
     def getArch(self):
         return self._archCoords
 
-    # returns list of deck coordinates
+    # returns Polyline of deck coordinates
     def getDeck(self):
         return self._deckCoords
 
     # returns anchor offset
     def getAnchOff(self):
-        return self._archCoords[0].y() - self._deckCoords[0].y() 
+        return self._archCoords.ys()[0] - self._deckCoords.ys()[0]
 
     # returns number of segments in arch
     def segments(self):
@@ -60,32 +104,20 @@ class Bridge:
 
     # returns arch height (h_arch)
     def archHeight(self):
-        maxZ = self._archCoords[0].z()
-        minZ = self._archCoords[0].z()
-        for v in self._archCoords:
-            minZ = min(minZ, v.z())
-            maxZ = max(maxZ, v.z())
-        return maxZ - minZ
+        zs = self._archCoords.zs()
+        return zs.max() - zs.min()
 
     # returns arch depth (d_arch)
     def archDepth(self):
-        maxY = self._archCoords[0].y()
-        minY = self._archCoords[0].y()
-        for v in self._archCoords:
-            minY = min(minY, v.y())
-            maxY = max(maxY, v.y())
-        return maxY - minY
+        ys = self._archCoords.ys()
+        return ys.max() - ys.min()
 
     # returns arch angle of inclination (theta)
     def archAngle(self):
 
         hArch = self.archHeight()
-        maxY = self._archCoords[0].y()
-        minY = self._archCoords[0].y()
-
-        for v in self._archCoords:
-            minY = min(minY, v.y())
-            maxY = max(maxY, v.y())
+        maxY = self._archCoords.ys().max()
+        minY = self._archCoords.ys().min()
 
         if abs(abs(minY) - abs(maxY)) < .01:
             return math.pi / 2.
@@ -103,12 +135,8 @@ class Bridge:
     def archRadius(self):
 
         hArch = self.archHeight()
-        maxY = self._archCoords[0].y()
-        minY = self._archCoords[0].y()
-
-        for v in self._archCoords:
-            minY = min(minY, v.y())
-            maxY = max(maxY, v.y())
+        maxY = self._archCoords.ys().max()
+        minY = self._archCoords.ys().min()
 
         if abs(abs(minY) - abs(maxY)) < .01:
             return hArch
@@ -120,14 +148,18 @@ class Bridge:
     # returns list of internal arch force maginitudes if self is 
     # defined with SGSM
     def getArchForces(self):
+        return self._archForces().tolist()
+
+    # returns read-only array of internal arch force magnitudes
+    def _archForces(self):
         if self._sgsm == None:
             raise Exception("bridge not defined with SGSM")
-        return self._sgsm.getForces()
+        return self._geometryValue('archForces', self._sgsm.getForces)
 
     # returns maximum absolute value of internal arch force magnitude if 
     # self is defined with SGSM
     def maxArchForce(self):
-        return max(map(abs, self.getArchForces()))
+        return float(np.abs(self._archForces()).max())
 
     # returns tuple of reaction vectors using q_arch value qArch
     def getArchReactions(self, qArch):
@@ -144,41 +176,49 @@ class Bridge:
         R2 = Vector(-H, R2.y(), R2.z() + tribL2 * qArch)
         return (R1, R2)
 
-    # returns list of force vectors in cables using q
+    # returns Polyline of force vectors in cables using q
     def getCableVectorForces(self, q):
+        return Polyline(self._cableVectorForces(q))
 
-        arch = self.getArch()
-        deck = self.getDeck()
-        forces = []
+    # returns read-only N x 3 array of force vectors in cables using q
+    def _cableVectorForces(self, q):
 
-        for i in range(1, self.segments()):
-            tribL1 = (deck[i] - deck[i-1]).length()
-            tribL2 = (deck[i+1] - deck[i]).length()
-            tribL = (tribL1 + tribL2) / 2.
+        def make():
+            deckLens = self._deckCoords.lengths()
+            tribL = (deckLens[:-1] + deckLens[1:]) / 2.
             Pz = q * tribL
-            F =  deck[i] - arch[i]
-            Py = F.y() * Pz / F.z()
-            forces.append(Vector(0.0, Py, Pz))
-
-        return forces
+            F = (self._deckCoords - self._archCoords)[1:-1]
+            Py = F.ys() * Pz / F.zs()
+            a = Polyline.fromXYZ(np.zeros(len(Pz)), Py, Pz).array()
+            a.setflags(write=False)
+            return a
+
+        return self._loadValue(('cable vectors', q), make)
+
+    # returns read-only array of force magnitudes in cables using q
+    def _cableForces(self, q):
+        def make():
+            a = Polyline(self._cableVectorForces(q)).norms()
+            a.setflags(write=False)
+            return a
+        return self._loadValue(('cable forces', q), make)
 
     # returns list of force maginitudes in cables using q
     def getCableForces(self, q):
-        vectorForces = self.getCableVectorForces(q)
-        return map(lambda x: x.length(), vectorForces)
+        return self._cableForces(q).tolist()
 
     # returns maximum force maginitude in cables using q
     def maxCableForce(self, q):
-        return max(self.getCableForces(q))
+        return float(self._cableForces(q).max())
 
     # returns list of x-coordinates of nodes
     def getXs(self):
-        return map(lambda v: v.x(), self._archCoords)
+        return self._archCoords.xs().tolist()
 
     # returns list values in moment diagram of deck
     def getDeckMomentZ(self, q):
 
-        cableForces = map(lambda a: a.y(), self.getCableVectorForces(q))
+        cableForces = self._cableVectorForces(q)[:, 1].tolist()
         xs = self.getXs()
         Ms = []
         M = 0.
@@ -202,19 +242,82 @@ class Bridge:
 
     # returns list lengths of arch segments
     def getArchLengths(self):
-        archLens = []
-        for i in range(1, len(self._archCoords)):
-            v = self._archCoords[i] - self._archCoords[i-1]
-            archLens.append(v.length())
-        return archLens
+        return self._archLengths().tolist()
+
+    # returns read-only array of lengths of arch segments
+    def _archLengths(self):
+        return self._geometryValue('archLengths', 
+                                   self._archCoords.lengths)
 
     # returns list of lengths of cables
     def getCableLengths(self):
-        cableLens = []
-        for i in range(1, len(self._archCoords) - 1):
-            v = self._archCoords[i] - self._deckCoords[i]
-            cableLens.append(v.length())
-        return cableLens
+        return self._cableLengths().tolist()
+
+    # returns read-only array of lengths of cables
+    def _cableLengths(self):
+        def make():
+            return (self._archCoords - self._deckCoords)[1:-1].norms()
+        return self._geometryValue('cableLengths', make)
+
+    # returns InfluenceLines object for the deck moments, cable forces,
+    # and arch reactions of self under moving loads. Only the last 
+    # influenceCacheSize bridges used keep theirs.
+    def influenceLines(self):
+        cache = Bridge._influenceCache
+        if cache.info()['maxSize'] != Bridge.influenceCacheSize:
+            cache.resize(Bridge.influenceCacheSize)
+        key = weakref.ref(self)
+        lines = cache.get(key)
+        if lines is None:
+            lines = InfluenceLines(self)
+            cache.put(key, lines)
+        return lines
+
+    # returns array of deck loads at the interior nodes, one row per 
+    # load case, for the rows of qs. Each row is a q for the whole deck
+    # or a q for each interior node.
+    def _caseLoads(self, qs):
+        deckLens = self._deckCoords.lengths()
+        tribL = (deckLens[:-1] + deckLens[1:]) / 2.
+        return np.array(map(lambda q: np.asarray(q, dtype=float) * tribL,
+                            qs))
+
+    # returns SGSMCases object solving the graphic statics of the arch
+    # of self (with its H and cable directions) for several load cases
+    # together, the rows of qs are as in _caseLoads and qArch is q_arch
+    def loadCases(self, qs, qArch):
+        P = self._caseLoads(qs)
+        archLens = self._archLengths()
+        PArch = qArch * ((archLens[:-1] + archLens[1:])/2.0)
+        F = (self._archCoords - self._deckCoords)[1:-1]
+        FsXY = F.ys() * P / F.zs()
+        FsXZ = P + PArch
+        xs = self._deckCoords.xs()[1:-1]
+        return SGSMCases(self.getL(), xs, FsXY, FsXZ, self.getH())
+
+    # returns dictionary of tuples (mins, maxs) of arrays of the 
+    # smallest and largest 'arch force', 'cable force', 'deck moment',
+    # and 'reactions' (R1y, R1z, R2y, R2z) over the load cases in the
+    # rows of qs (as in _caseLoads) with q_arch qArch
+    def caseEnvelopes(self, qs, qArch):
+
+        cases = self.loadCases(qs, qArch)
+        P = self._caseLoads(qs)
+        lines = self.influenceLines()
+
+        R1, R2 = cases.getReactions()
+        archLens = self._archLengths()
+        R1[:, 1] += archLens[0] / 2. * qArch
+        R2[:, 1] += archLens[-1] / 2. * qArch
+
+        values = {'arch force': cases.getForces(),
+                  'cable force': lines.nodeResponse('cable force', P),
+                  'deck moment': lines.nodeResponse('deck moment', P),
+                  'reactions': np.hstack((R1, R2))}
+        d = {}
+        for s, v in values.items():
+            d[s] = (v.min(axis=0), v.max(axis=0))
+        return d
 
     # returns load path where load is q, relative arch strength is 
     # sigArch, and relative cable strength is sigCab
@@ -233,6 +336,65 @@ class Bridge:
 
         return lp 
 
+    # returns dictionary of the values of all the built-in optimization
+    # input functions (see optimization.optDict) for load q, q_arch 
+    # qArch, relative strengths sigArch and sigCab, and, if h is given,
+    # selected arch height h. The values come from one pass over the 
+    # coordinate arrays instead of calling each method, and are cached 
+    # with the other load dependent values.
+    def metrics(self, q, qArch, sigArch=1., sigCab=1., h=None):
+
+        make = lambda: self._metrics(q, qArch, sigArch, sigCab)
+        key = ('metrics', q, qArch, sigArch, sigCab)
+        d = dict(self._loadValue(key, make))
+        if h is not None:
+            d['select arch height'] = abs(h - d['arch height'])
+        return d
+
+    # returns dictionary of metrics without 'select arch height'
+    def _metrics(self, q, qArch, sigArch, sigCab):
+
+        xs = self._archCoords.xs()
+        ys = self._archCoords.ys()
+        zs = self._archCoords.zs()
+        maxY = ys.max()
+        minY = ys.min()
+        hArch = zs.max() - zs.min()
+
+        if abs(abs(minY) - abs(maxY)) < .01:
+            radius = hArch
+        elif abs(maxY) > abs(minY):
+            radius = math.sqrt(hArch**2 + maxY**2)
+        else:
+            radius = math.sqrt(hArch**2 + minY**2)
+
+        archForces = np.abs(self._archForces())
+        archLens = self._archLengths()
+        Py = self._cableVectorForces(q)[:, 1]
+        cableForces = self._cableForces(q)
+        cableLens = self._cableLengths()
+
+        V = -Py.sum() - np.sum(xs[1:-1] * np.abs(Py)) / self.getL()
+        Vs = V + np.concatenate(([0.], np.cumsum(Py[:-1])))
+        Ms = np.cumsum(Vs * np.diff(xs)[:-1])
+
+        R1 = self.getArchReactions(qArch)[0]
+        maxCable = float(cableForces.max())
+        maxArch = float(archForces.max())
+
+        d = {'cable force': maxCable,
+             'arch force': maxArch,
+             'y react': abs(R1.y()),
+             'z react': abs(R1.z()),
+             'arch height': hArch,
+             'arch depth': maxY - minY,
+             'arch radial length': radius,
+             'deck moment': np.abs(Ms).max(),
+             'axial force': max(maxCable, maxArch),
+             'load path': np.sum(archForces * archLens) / sigArch + 
+                          np.sum(cableForces * cableLens) / sigCab}
+        return d
+
     # returns string with deck and arch coordinates
     def __str__(self):
         s = 'Deck: ' + str(map(str, self.getDeck())) + "\n"
@@ -0,0 +1,105 @@
+from polyline import Polyline
+from bridge import Bridge
+import numpy as np
+
+class BridgeBatch:
+
+    # creates BridgeBatch object for N designs that share x coordinates 
+    # xs and deck z coordinates deckZs. deckYs, guessYs, guessZs, 
+    # archYs, and archZs are N x (segments + 1) arrays where the guess 
+    # is the converged input of the iteration and the arch is its form.
+    # anchorOffsets, Hs, qs, qArchs, iterations, residuals, and 
+    # converged have one value per design.
+    def __init__(self, xs, deckYs, deckZs, guessYs, guessZs, archYs, 
+                 archZs, anchorOffsets, Hs, qs, qArchs, iterations, 
+                 residuals, converged):
+        self._xs = xs
+        self._deckYs = deckYs
+        self._deckZs = deckZs
+        self._guessYs = guessYs
+        self._guessZs = guessZs
+        self._archYs = archYs
+        self._archZs = archZs
+        self._anchorOffsets = anchorOffsets
+        self._Hs = Hs
+        self._qs = qs
+        self._qArchs = qArchs
+        self._iterations = iterations
+        self._residuals = residuals
+        self._converged = converged
+
+    # returns number of designs
+    def __len__(self):
+        return len(self._Hs)
+
+    # returns number of segments in each arch
+    def segments(self):
+        return len(self._xs) - 1
+
+    # returns array of x coordinates of the nodes
+    def getXs(self):
+        return self._xs
+
+    # returns N x (segments + 1) array of arch y coordinates
+    def getArchYs(self):
+        return self._archYs
+
+    # returns N x (segments + 1) array of arch z coordinates
+    def getArchZs(self):
+        return self._archZs
+
+    # returns N x (segments + 1) array of deck y coordinates
+    def getDeckYs(self):
+        return self._deckYs
+
+    # returns array of deck z coordinates (the same for every design)
+    def getDeckZs(self):
+        return self._deckZs
+
+    # returns array of anchor offsets
+    def getAnchOffs(self):
+        return self._anchorOffsets
+
+    # returns array of horizontal forces
+    def getHs(self):
+        return self._Hs
+
+    # returns array of deck loads
+    def getQs(self):
+        return self._qs
+
+    # returns array of arch self-weights
+    def getQArchs(self):
+        return self._qArchs
+
+    # returns array of the number of iterations of each design
+    def iterations(self):
+        return self._iterations
+
+    # returns array of the largest change in the last iteration of each
+    # design
+    def residuals(self):
+        return self._residuals
+
+    # returns boolean array, True where the design converged
+    def converged(self):
+        return self._converged
+
+    # returns array of arch heights (h_arch)
+    def archHeight(self):
+        return self._archZs.max(axis=1) - self._archZs.min(axis=1)
+
+    # returns array of arch depths (d_arch)
+    def archDepth(self):
+        return self._archYs.max(axis=1) - self._archYs.min(axis=1)
+
+    # returns Bridge object for design i, the same as fromDeck returns
+    def bridge(self, i):
+        import fromdeck
+        deckCoords = Polyline.fromXYZ(self._xs, self._deckYs[i], 
+                                      self._deckZs)
+        guess = Polyline.fromXYZ(self._xs, self._guessYs[i], 
+                                 self._guessZs[i])
+        sgsm = fromdeck.deckToSGSM(guess, deckCoords, self._Hs[i], 
+                                   self._qs[i], self._qArchs[i])
+        return Bridge(sgsm, deckCoords)
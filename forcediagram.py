@@ -1,23 +1,22 @@
 from vector import Vector
-from copy import deepcopy
+from polyline import Polyline
+from copy import copy
+import numpy as np
 
 class ForceDiagram:
 
     # creates self._downCoords array by making each item the cumulative
     # sum of previous items and the corresponding force in Fs
     def _addForces(self, Fs):
-        self._downCoords = [Vector()]
-        vsum = Vector()
-        for f in Fs:
-            vsum += Vector(y=f)
-            self._downCoords.append(vsum)
+        sums = np.cumsum(np.asarray(Fs, dtype=float))
+        ys = np.concatenate(([0.], sums))
+        self._downCoords = Polyline.fromXYZ(np.zeros(len(ys)), ys)
 
     # produces test force diagram for forces Fs and horizontal force H
     def __init__(self, Fs, H):
         self._addForces(Fs)
-        self._upCoords = []
-        last = self._downCoords[len(self._downCoords) - 1]
-        halfHeight = last.y() / 2.0
+        self._upCoords = Polyline()
+        halfHeight = self._downCoords.ys()[-1] / 2.0
         self._o = Vector(H, halfHeight)
         self._testO = self._o
         self._H = H
@@ -28,8 +27,8 @@ class ForceDiagram:
     # the direction vector between the supports 
     def findReactions(self, v):
         y = v.intersect(self._o, 0.0)
-        top = self._downCoords[len(self._downCoords) - 1]
-        self._upCoords = [Vector(), Vector(y=y), deepcopy(top)]
+        top = self._downCoords.ys()[-1]
+        self._upCoords = Polyline.fromXYZ(np.zeros(3), [0., y, top])
         self._o = Vector(self._H, y)
         self._isTest = False
 
@@ -60,24 +59,21 @@ class ForceDiagram:
     def isXY(self):
         return self._xy
 
-    # translates diagram from xy-plane to xz-plane
-    def xytoxz(self):
+    # returns diagram projected from xy-plane to xz-plane, self is not
+    # changed
+    def toXZ(self):
         assert self._xy
-        for i in range(len(self._upCoords)):
-            self._upCoords[i].xytoxz()
-        for i in range(len(self._downCoords)):
-            self._downCoords[i].xytoxz()
-        self._o.xytoxz()
-        self._testO.xytoxz()
-        self._xy = False
+        xz = copy(self)
+        xz._upCoords = self._upCoords.toXZ()
+        xz._downCoords = self._downCoords.toXZ()
+        xz._o = self._o.toXZ()
+        xz._testO = self._testO.toXZ()
+        xz._xy = False
+        return xz
 
     # returns internal force vectors
     def forces(self):
-        forces = []
-        for coord in self._downCoords:
-            forceVect = coord - self._o
-            forces.append(forceVect.length())
-        return forces
+        return (self._downCoords - self._o).norms().tolist()
 
 
     
\ No newline at end of file
@@ -1,45 +1,62 @@
 from vector import Vector
+from polyline import Polyline
 from graphicstatics import GraphicStatics
+import graphicstatics
 from sgsm import SGSM
 from bridge import Bridge
+from bridgebatch import BridgeBatch
+from lrucache import LRUCache
+import newton
+import numpy as np
 import math 
 
-# returns SGSM with loading based on guess arch defined by archCoords, 
-# deck form defined by deckCoords, H, q, and qArch (q_arch)
-def deckToSGSM(archCoords, deckCoords, H, q, qArch):
+# returns tuple (L, xs, FsXY, FsXZ) of the length, the x-coordinates of
+# the cables, and the applied forces in the xy- and xz-planes for guess 
+# arch archCoords, deck deckCoords, q, and qArch (q_arch)
+def _loads(archCoords, deckCoords, q, qArch):
+
+    archCoords = Polyline(archCoords)
+    deckCoords = Polyline(deckCoords)
 
     if len(archCoords) != len(deckCoords):
         raise Exception('Mismatched arrays')
+    if np.any(archCoords.xs() != deckCoords.xs()):
+        raise Exception('Mismatched arrays')
+
+    deckLengths = deckCoords.lengths()
+    archLengths = archCoords.lengths()
+
+    P = q * ((deckLengths[:-1] + deckLengths[1:])/2.0) 
+    PArch = qArch * ((archLengths[:-1] + archLengths[1:])/2.0) 
+    F = (archCoords - deckCoords)[1:-1]
+    FsXY = (F.ys() * P / F.zs()).tolist()
+    FsXZ = (P + PArch).tolist()
+    xs = deckCoords.xs()[1:-1].tolist()
+
+    L = archCoords.xs()[-1]
 
-    nodes = len(archCoords)
-    for i in range(nodes):
-        if archCoords[i].x() != deckCoords[i].x():
-            raise Exception('Mismatched arrays')
-
-    deckLengths = []
-    archLengths = []
-    for i in range(1, nodes):
-        deckLengths.append((deckCoords[i] - deckCoords[i-1]).length())
-        archLengths.append((archCoords[i] - archCoords[i-1]).length())
-
-    FsXY = []
-    FsXZ = []
-    xs = []
-    for i in range(1, nodes - 1):
-        P = q * ((deckLengths[i-1] + deckLengths[i])/2.0) 
-        PArch = qArch * ((archLengths[i-1] + archLengths[i])/2.0) 
-        F = archCoords[i] - deckCoords[i]
-        FsXY.append(F.y() * P / F.z())
-        FsXZ.append(P + PArch)
-        xs.append(deckCoords[i].x())
-
-    L = archCoords[nodes - 1].x()
+    return (L, xs, FsXY, FsXZ)
+
+# returns form of the SGSM that deckToSGSM would return, computed with 
+# graphicstatics.solve without building the SGSM
+def deckToForm(archCoords, deckCoords, H, q, qArch):
+    L, xs, FsXY, FsXZ = _loads(archCoords, deckCoords, q, qArch)
+    ys = graphicstatics.solve(L, xs, FsXY, H)[0]
+    zs = graphicstatics.solve(L, xs, FsXZ, H)[0]
+    return Polyline.fromXYZ(np.concatenate(([0.], xs, [L])), ys, zs)
+
+# returns SGSM with loading based on guess arch defined by archCoords, 
+# deck form defined by deckCoords, H, q, and qArch (q_arch)
+def deckToSGSM(archCoords, deckCoords, H, q, qArch):
+
+    L, xs, FsXY, FsXZ = _loads(archCoords, deckCoords, q, qArch)
 
     gsxy = GraphicStatics(L, xs, FsXY, H)
     gsxz = GraphicStatics(L, xs, FsXZ, H)
 
-    if archCoords[0].z() != 0.:
-        zs = map(lambda v: v.z(), archCoords)
+    archCoords = Polyline(archCoords)
+    if archCoords.zs()[0] != 0.:
+        zs = archCoords.zs()
         if H > 0.:
             vertexHeight = max(zs)
         else:
@@ -49,39 +66,146 @@ def deckToSGSM(archCoords, deckCoords, H, q, qArch):
     return SGSM(gsxy, gsxz)
 
 # determines whether all the the coordinates in coords1 and coords2
-# are within tol of each other
-def isSame(coords1, coords2, tol):
+# are within tol of each other, or within rtol relative to coords2
+def isSame(coords1, coords2, tol, rtol=0.):
     assert len(coords1) == len(coords2)
-    for i in range(len(coords2)):
-        diff = coords1[i] - coords2[i]
-        if diff.y() > tol or diff.z() > tol:
-            return False
-    return True
+    coords1 = Polyline(coords1)
+    coords2 = Polyline(coords2)
+    return _isSame(_flatten(coords1), _flatten(coords2), tol, rtol)
+
+# array version of isSame for vectors v1 and v2
+def _isSame(v1, v2, tol, rtol):
+    return bool(np.all(np.abs(v1 - v2) <= tol + rtol * np.abs(v2)))
+
+# returns the y and z coordinates of Polyline coords as one vector
+def _flatten(coords):
+    return np.concatenate((coords.ys(), coords.zs()))
+
+# returns Polyline with x coordinates xs and y and z coordinates from 
+# vector v made by _flatten
+def _unflatten(xs, v):
+    n = len(xs)
+    return Polyline.fromXYZ(xs, v[:n], v[n:])
+
+# fixed-point iteration x = g(x) from x where each step is a Picard 
+# step under-relaxed by relax (relax=1. is the plain g(x)), history is
+# unused
+def _picard(g, x, tol, rtol, maxIter, relax, history=None):
+    for i in range(1, maxIter + 1):
+        gx = g(x)
+        if not np.all(np.isfinite(gx)):
+            return (x, i, float('inf'), False)
+        res = np.abs(gx - x).max()
+        if _isSame(x, gx, tol, rtol):
+            return (x, i, res, True)
+        if relax == 1.:
+            x = gx
+        else:
+            x = x + relax * (gx - x)
+    return (x, maxIter, res, False)
+
+# fixed-point iteration x = g(x) from x with Anderson mixing over the 
+# last history steps and mixing parameter relax. If the residual more 
+# than doubles the history is dropped and an under-relaxed Picard step 
+# is taken.
+def _anderson(g, x, tol, rtol, maxIter, relax, history):
+    dXs = []
+    dFs = []
+    prevX = None
+    prevF = None
+    for i in range(1, maxIter + 1):
+        gx = g(x)
+        if not np.all(np.isfinite(gx)):
+            return (x, i, float('inf'), False)
+        f = gx - x
+        res = np.abs(f).max()
+        if _isSame(x, gx, tol, rtol):
+            return (x, i, res, True)
+        if prevF is not None and res > 2. * np.abs(prevF).max():
+            dXs = []
+            dFs = []
+            prevX = x
+            prevF = f
+            x = x + relax / 2. * f
+            continue
+        if prevF is not None:
+            dXs = (dXs + [x - prevX])[-history:]
+            dFs = (dFs + [f - prevF])[-history:]
+        prevX = x
+        prevF = f
+        if dFs:
+            dF = np.column_stack(dFs)
+            dX = np.column_stack(dXs)
+            gamma = np.linalg.lstsq(dF, f, rcond=None)[0]
+            x = x + relax * f - np.dot(dX + relax * dF, gamma)
+        else:
+            x = x + relax * f
+    return (x, maxIter, res, False)
+
+# Newton iteration for x = g(x) from x where newtonStep(x) returns the 
+# Newton step of the funicular equations. Each iteration takes a Newton 
+# step from g(x), so the first steps move the starting guess to the 
+# right scale, and relax damps the Newton correction.
+def _newton(g, x, tol, rtol, maxIter, relax, newtonStep):
+    for i in range(1, maxIter + 1):
+        gx = g(x)
+        if not np.all(np.isfinite(gx)):
+            return (x, i, float('inf'), False)
+        res = np.abs(gx - x).max()
+        if _isSame(x, gx, tol, rtol):
+            return (x, i, res, True)
+        x = gx + relax * (newtonStep(gx) - gx)
+    return (x, maxIter, res, False)
+
+# available fixed-point solvers for iterate
+_solvers = {'picard': _picard, 'anderson': _anderson}
 
 # iterates to get SGSM based on deck coordinates deckCoords, H, q, and 
 # qArch. archCoords are the coordinates of the starting guess arch and
 # tol is the distance between points at which two forms are considered
-# to be the same
-def iterate(archCoords, deckCoords, H, q, qArch, tol):
+# to be the same (rtol is the same relative to the coordinates). method 
+# is 'picard', 'anderson', or 'newton', relax is the under-relaxation 
+# (or Newton damping) factor, and
+# history is the number of steps mixed by 'anderson'. Returns tuple 
+# (sgsm, iterations, residual, converged) where residual is the largest 
+# change in the arch coordinates in the last iteration and converged is
+# False if maxIter was reached. If the form stopped being finite the 
+# residual is infinity (and converged is False), which tells the two 
+# failures apart.
+def iterateInfo(archCoords, deckCoords, H, q, qArch, tol, rtol=0., 
+                maxIter=2000, method='picard', relax=1., history=5):
 
-    prevCoords = archCoords
-    sgsm = deckToSGSM(archCoords, deckCoords, H, q, qArch)
-    coords = sgsm.getForm()
-    i = 0
+    if method not in _solvers and method != 'newton':
+        raise Exception('unknown method ' + str(method))
+    if maxIter < 1:
+        raise Exception('maxIter must be at least 1')
 
-    while (not isSame(prevCoords, coords, tol)):
-        if i > 2000: 
-            print "exceeded iteration limit"
-            break
-        sgsm = deckToSGSM(coords, deckCoords, H, q, qArch)
-        prevCoords = coords
-        coords = sgsm.getForm()
-        i += 1
+    xs = Polyline(archCoords).xs()
+    g = lambda v: _flatten(deckToForm(_unflatten(xs, v), deckCoords, H,
+                                      q, qArch))
+    x = _flatten(Polyline(archCoords))
+
+    if method == 'newton':
+        n = len(xs)
+        step = lambda v: np.concatenate(newton.step(xs, v[:n], v[n:], 
+                                            deckCoords, H, q, qArch))
+        x, i, res, converged = _newton(g, x, tol, rtol, maxIter, relax,
+                                       step)
+    else:
+        x, i, res, converged = _solvers[method](g, x, tol, rtol, 
+                                                maxIter, relax, history)
 
-    return sgsm
+    sgsm = deckToSGSM(_unflatten(xs, x), deckCoords, H, q, qArch)
+    return (sgsm, i, res, converged)
 
-# returns list of deck coordinates base on dividing deck defined by deck
-# function and length L into segments sections and shifting it by 
+# iterates to get SGSM, arguments are the same as iterateInfo
+def iterate(archCoords, deckCoords, H, q, qArch, tol, rtol=0., 
+            maxIter=2000, method='picard', relax=1., history=5):
+    return iterateInfo(archCoords, deckCoords, H, q, qArch, tol, rtol, 
+                       maxIter, method, relax, history)[0]
+
+# returns Polyline of deck coordinates base on dividing deck defined by
+# deck function and length L into segments sections and shifting it by 
 # anchorOffset
 def getDeckCoords(deck, L, segments, anchorOffset):
 
@@ -99,61 +223,286 @@ def getDeckCoords(deck, L, segments, anchorOffset):
         x = (L/segments) * i
         deckCoords.append(deck(x) - aoV)
 
-    return deckCoords
+    return Polyline(deckCoords)
 
 # return starting guess arch based on deck coordinates deckCoords
 def getStartingArch(deckCoords):
-    L = deckCoords[len(deckCoords)-1].x() - deckCoords[0].x()
-    f = lambda x: -(x - L/2.)**2 + (L/2.)**2
-    archCoords = []
-    for v in deckCoords:
-        archCoords.append(Vector(v.x(), 0.0, f(v.x())))
-    return archCoords
+    xs = Polyline(deckCoords).xs()
+    L = xs[-1] - xs[0]
+    return Polyline.fromXYZ(xs, 0.0, -(xs - L/2.)**2 + (L/2.)**2)
+
+# return starting arch for deckCoords from start, which is None, a list
+# of arch coordinates, or a Bridge. Falls back to getStartingArch if 
+# start does not have the same x coordinates as the deck or is not 
+# finite.
+def _startArch(deckCoords, start):
+    if isinstance(start, Bridge):
+        start = start.getArch()
+    if start is not None:
+        start = Polyline(start)
+        xs = Polyline(deckCoords).xs()
+        if len(start) == len(xs) and np.array_equal(start.xs(), xs) \
+                and np.all(np.isfinite(start.array())):
+            return start
+    return getStartingArch(deckCoords)
 
 # return d_deck for deck with function deck and length L
 def getDeckDepth(deck, L):
     if type(deck) == list: 
-        deckCoords = deck
+        deckCoords = Polyline(deck)
     else:
         deckCoords = getDeckCoords(deck, L, int(L * 5), 0.)
-    deckCoordsY = map(lambda v: v.y(), deckCoords)
-    dDeck = max(deckCoordsY) - min(deckCoordsY) 
+    deckCoordsY = deckCoords.ys()
+    dDeck = deckCoordsY.max() - deckCoordsY.min() 
     return dDeck
 
 # return list of segment lengths for deck with function deck and length
 # L that is divided into segs segments
 def getDeckLengths(deck, L, segs):
     deckCoords = getDeckCoords(deck, L, segs, 0.)
-    deckLens = []
-    for i in range(1, len(deckCoords)):
-        v = deckCoords[i] - deckCoords[i-1]
-        deckLens.append(v.length())
-    return deckLens
+    return deckCoords.lengths().tolist()
 
 # returns a Bridge object for the funicular form of a bridge with 
 # length L, anchor offset anchorOffset, horizontal force H, deck load 
 # q, and arch weight qArch where deck is a function or a set of 
-# coordinates, and number of segments is required if deck is a function 
-def fromDeck(deck, L, anchorOffset, H, q, qArch, segments=None):
+# coordinates, and number of segments is required if deck is a function.
+# method selects the iterate solver ('picard', 'anderson', or 'newton').
+# start is the starting arch, given as arch coordinates or a Bridge 
+# (getStartingArch is used if it is None or does not match the deck).
+# tol, rtol, maxIter, and relax are as in iterateInfo. If info is True,
+# returns tuple (bridge, iterations, residual, converged).
+def fromDeck(deck, L, anchorOffset, H, q, qArch, segments=None, 
+             method='picard', info=False, start=None, tol=.01, rtol=0.,
+             maxIter=2000, relax=1.):
 
     if type(deck) == list: 
-        deckCoords = map(lambda v: v - Vector(y=anchorOffset), deck)
+        deckCoords = Polyline(deck) - Vector(y=anchorOffset)
     else:
         if segments == None:
             raise Exception("segments needed if deck is function")
         deckCoords = getDeckCoords(deck, L, segments, anchorOffset)
 
-    archCoords = getStartingArch(deckCoords)
-    sgsm = iterate(archCoords, deckCoords, H, q, qArch, .01)
+    archCoords = _startArch(deckCoords, start)
+    sgsm, i, res, converged = iterateInfo(archCoords, deckCoords, H, q, 
+                                          qArch, tol, rtol, maxIter, 
+                                          method, relax)
     bridge = Bridge(sgsm, deckCoords)
+    if info:
+        return (bridge, i, res, converged)
     return bridge
 
+# returns tuple (ys, zs) of the form found from each of the guess 
+# arches with y and z coordinates ys and zs (one row per design), the 
+# same as deckToForm does for one design. xs are the node x 
+# coordinates, deckYs the deck y coordinates of each design, deckZs the
+# shared deck z coordinates, and trib the deck tributary lengths.
+def _batchForm(xs, ys, zs, deckYs, deckZs, trib, Hs, qs, qArchs):
+
+    P = qs[:, np.newaxis] * trib
+    archLens = np.sqrt(np.diff(xs)**2 + np.diff(ys)**2 + np.diff(zs)**2)
+    tribArch = (archLens[:, :-1] + archLens[:, 1:])/2.0
+    PArch = qArchs[:, np.newaxis] * tribArch
+    u = ys[:, 1:-1] - deckYs[:, 1:-1]
+    w = zs[:, 1:-1] - deckZs[1:-1]
+    FsXY = u * P / w
+    FsXZ = P + PArch
+
+    L = xs[-1]
+    formYs = graphicstatics.solve(L, xs[1:-1], FsXY, Hs)[0]
+    formZs = graphicstatics.solve(L, xs[1:-1], FsXZ, Hs)[0]
+    return (formYs, formZs)
+
+# returns BridgeBatch with the funicular forms of N designs that share
+# the deck function deck, length L, and number of segments. 
+# anchorOffsets, Hs, qs, and qArchs are arrays of length N (or scalars).
+# All designs take Picard steps (under-relaxed by relax) together as 
+# 2-D arrays and each design is masked out once it is within tol (or 
+# rtol) of its previous form, as in iterate.
+def fromDeckBatch(deck, L, anchorOffsets, Hs, qs, qArchs, segments, 
+                  tol=.01, rtol=0., maxIter=2000, relax=1.):
+
+    if maxIter < 1:
+        raise Exception('maxIter must be at least 1')
+    params = map(lambda a: np.atleast_1d(np.asarray(a, dtype=float)), 
+                 (anchorOffsets, Hs, qs, qArchs))
+    anchorOffsets, Hs, qs, qArchs = np.broadcast_arrays(*params)
+    N = len(Hs)
+
+    baseDeck = getDeckCoords(deck, L, segments, 0.)
+    xs = baseDeck.xs()
+    deckYs = baseDeck.ys()[np.newaxis, :] - anchorOffsets[:, np.newaxis]
+    deckZs = baseDeck.zs()
+    deckLens = baseDeck.lengths()
+    trib = (deckLens[:-1] + deckLens[1:])/2.0
+
+    start = getStartingArch(baseDeck)
+    ys = np.tile(start.ys(), (N, 1))
+    zs = np.tile(start.zs(), (N, 1))
+    archYs = ys.copy()
+    archZs = zs.copy()
+    iterations = np.zeros(N, dtype=int)
+    residuals = np.zeros(N)
+    converged = np.zeros(N, dtype=bool)
+    active = np.arange(N)
+
+    for i in range(1, maxIter + 1):
+
+        if len(active) == 0:
+            break
+
+        gys, gzs = _batchForm(xs, ys[active], zs[active], 
+                              deckYs[active], deckZs, trib, Hs[active], 
+                              qs[active], qArchs[active])
+        dys = gys - ys[active]
+        dzs = gzs - zs[active]
+        res = np.maximum(np.abs(dys).max(axis=1), np.abs(dzs).max(axis=1))
+        same = np.all(np.abs(dys) <= tol + rtol * np.abs(gys), axis=1) \
+                & np.all(np.abs(dzs) <= tol + rtol * np.abs(gzs), axis=1)
+        finite = np.all(np.isfinite(gys), axis=1) \
+                & np.all(np.isfinite(gzs), axis=1)
+
+        iterations[active] = i
+        residuals[active] = np.where(finite, res, float('inf'))
+        archYs[active] = gys
+        archZs[active] = gzs
+        converged[active] = same
+
+        keep = (same | ~finite)[:, np.newaxis]
+        if relax == 1.:
+            ys[active] = np.where(keep, ys[active], gys)
+            zs[active] = np.where(keep, zs[active], gzs)
+        else:
+            ys[active] += np.where(keep, 0., relax * dys)
+            zs[active] += np.where(keep, 0., relax * dzs)
+        active = active[~same & finite]
+
+    return BridgeBatch(xs, deckYs, deckZs, ys, zs, archYs, archZs, 
+                       anchorOffsets, Hs, qs, qArchs, iterations, 
+                       residuals, converged)
+
+# cache of fromDeck results used by cachedFromDeck
+_cache = LRUCache(1024)
+
+# returns hashable identity of deck: its parameters for decks made by 
+# parabolicDeck or sineDeck, its coordinates if it is a list, and the 
+# function itself otherwise
+def deckKey(deck):
+    if type(deck) == list:
+        return tuple(map(tuple, Polyline(deck).array().tolist()))
+    return getattr(deck, 'key', deck)
+
+# returns deck with identity key made by deckKey, which must come from 
+# parabolicDeck, sineDeck, or a list of coordinates
+def deckFromKey(key):
+    if key[0] == 'parabolic':
+        return parabolicDeck(*key[1:])
+    if key[0] == 'sine':
+        return sineDeck(*key[1:])
+    if isinstance(key, tuple) and isinstance(key[0], tuple):
+        return map(lambda c: Vector(*c), key)
+    raise Exception("deck cannot be rebuilt from its key")
+
+# returns key of the fromDeck result for the given arguments
+def _cacheKey(deck, L, anchorOffset, H, q, qArch, segments, method, tol,
+              rtol, maxIter, relax):
+    if segments is not None:
+        segments = int(segments)
+    return (deckKey(deck), float(L), float(anchorOffset), float(H), 
+            float(q), float(qArch), segments, method, float(tol), 
+            float(rtol), int(maxIter), float(relax))
+
+# returns fromDeck result for the given arguments, reusing the Bridge 
+# from an earlier call with the same arguments if it is still cached.
+# start only changes the result within the iteration tolerance, so it is
+# not part of the key.
+def cachedFromDeck(deck, L, anchorOffset, H, q, qArch, segments=None, 
+                   method='picard', start=None, tol=.01, rtol=0., 
+                   maxIter=2000, relax=1., info=False):
+    key = _cacheKey(deck, L, anchorOffset, H, q, qArch, segments, method,
+                    tol, rtol, maxIter, relax)
+    result = _cache.get(key)
+    if result is None:
+        result = fromDeck(deck, L, anchorOffset, H, q, qArch, segments, 
+                          method, True, start, tol, rtol, maxIter, relax)
+        _cache.put(key, result)
+    if info:
+        return result
+    return result[0]
+
+# returns dictionary of hits, misses, size, and maxSize of the 
+# cachedFromDeck cache
+def cacheInfo():
+    return _cache.info()
+
+# makes cachedFromDeck use LRUCache cache and returns the cache it used
+# before, so a computation can run with its own cache and then give the
+# old one back
+def useCache(cache):
+    global _cache
+    old = _cache
+    _cache = cache
+    return old
+
+# sets the maximum number of Bridges kept by cachedFromDeck
+def setCacheSize(maxSize):
+    _cache.resize(maxSize)
+
+# removes the cached results for deck, or all results if deck is None,
+# and returns the number removed
+def invalidateCache(deck=None):
+    if deck is None:
+        return _cache.invalidate()
+    dk = deckKey(deck)
+    return _cache.invalidate(lambda key: key[0] == dk)
+
+# parameters that continuation can vary
+_pathParams = ('anchorOffset', 'H', 'q', 'qArch', 'dDeck')
+
+# returns list of Bridges for the funicular forms along a path of 
+# designs that share the arguments of fromDeck except param, which 
+# takes each value in values. param is 'anchorOffset', 'H', 'q', 
+# 'qArch', or 'dDeck' (which uses parabolicDeck(L, d) as the deck). The
+# converged arch of each design is the starting arch of the next. tol,
+# rtol, maxIter, and relax are as in iterateInfo. If info is True, 
+# returns tuple (bridges, total iterations, list of whether each form
+# finding converged).
+def continuation(deck, L, anchorOffset, H, q, qArch, segments, param, 
+                 values, method='picard', info=False, tol=.01, rtol=0., 
+                 maxIter=2000, relax=1.):
+
+    if param not in _pathParams:
+        raise Exception('cannot vary ' + str(param))
+
+    bridges = []
+    iterations = 0
+    converged = []
+    prev = None
+    for v in values:
+        d = {'deck': deck, 'anchorOffset': anchorOffset, 'H': H, 'q': q, 
+             'qArch': qArch}
+        if param == 'dDeck':
+            d['deck'] = parabolicDeck(L, v)
+        else:
+            d[param] = v
+        prev, i, res, c = fromDeck(d['deck'], L, d['anchorOffset'], 
+                                   d['H'], d['q'], d['qArch'], segments,
+                                   method, True, prev, tol, rtol, maxIter,
+                                   relax)
+        bridges.append(prev)
+        iterations += i
+        converged.append(c)
+
+    if info:
+        return (bridges, iterations, converged)
+    return bridges
+
 # returns a parabolic deck with length L, d_deck d, and h_deck h
 def parabolicDeck(L, d, h=0.):
     ay = d / ((L/2.)**2)
     az = h / ((L/2.)**2)
     parabola = lambda x, a: a * (-(x - L/2.)**2 + (L/2.)**2)
     arch = lambda x: Vector(x, parabola(x, ay), parabola(x, az))
+    arch.key = ('parabolic', float(L), float(d), float(h))
     return arch
 
 # returns a sinusoidal deck with length L, amplitude A, wavelength lmda,
@@ -164,13 +513,15 @@ def sineDeck(L, A, lmda, phi=0., h=0.):
     y = lambda x: A * math.sin(2 * math.pi / lmda * x + phi) - off
     z = lambda x: a * (-(x - L/2.)**2 + (L/2.)**2)
     deck = lambda x: Vector(x, y(x), z(x))
+    deck.key = ('sine', float(L), float(A), float(lmda), float(phi), 
+                float(h))
     return deck
 
 # plots deck shape for function deck with length L
 def plotDeck(deck, L):
     import matplotlib.pyplot as plt
     coords = getDeckCoords(deck, L, 100, 0.)
-    xs = map(lambda v: v.x(), coords)
-    ys = map(lambda v: v.y(), coords)
+    xs = coords.xs()
+    ys = coords.ys()
     plt.plot(xs, ys)
     plt.show()
\ No newline at end of file
@@ -1,22 +1,47 @@
-from vector import Vector
+from polyline import Polyline
 from forcediagram import ForceDiagram
-from copy import deepcopy
-
-# finds maximum y value in list coords
-def _maxy(coords):
-    maxy = 0.0
-    for coord in coords:
-        if coord.y() > maxy:
-            maxy = coord.y()
-    return maxy
-
-# finds minimum y value in list coords
-def _miny(coords):
-    miny = coords[0]
-    for coord in coords:
-        if coord.y() < miny:
-            miny = coord.y()
-    return miny
+from copy import copy
+import numpy as np
+
+# returns y-coordinates of form diagram for segment widths dxs, applied
+# force coordinates downYs in force diagram, and O at (H, Oy). downYs,
+# H, and Oy may have a leading axis with one row per diagram.
+def _formYs(dxs, downYs, H, Oy):
+    dys = (Oy - downYs) * (dxs / H)
+    zeros = np.zeros(dys.shape[:-1] + (1,))
+    return np.concatenate((zeros, np.cumsum(dys, axis=-1)), axis=-1)
+
+# solves graphic statics for length L, positions xs, forces Fs, and 
+# horizontal force H using array operations only. Returns tuple of 
+# arrays (form ys, force diagram ys, test form ys) and Oy, the y 
+# coordinate of O. The reactions are Oy and sum(Fs) - Oy. Matches the 
+# coordinates found by GraphicStatics exactly. Fs may be a 2-D array 
+# with one row of forces per diagram, and then H may be an array with
+# one value per row; the results then have one row (or value) per row.
+def solve(L, xs, Fs, H):
+    Fs = np.asarray(Fs, dtype=float)
+    H = np.asarray(H, dtype=float)
+    if Fs.ndim > 1 and H.ndim > 0:
+        H = H[:, np.newaxis]
+    zeros = np.zeros(Fs.shape[:-1] + (1,))
+    downYs = np.concatenate((zeros, np.cumsum(Fs, axis=-1)), axis=-1)
+    dxs = np.diff(np.concatenate(([0.], xs, [L])))
+    testOy = downYs[..., -1:] / 2.0
+    testYs = _formYs(dxs, downYs, H, testOy)
+    Oy = testOy + testYs[..., -1:] * ((0.0 - H) / (L - 0.0))
+    formYs = _formYs(dxs, downYs, H, Oy)
+    return (formYs, downYs, testYs, Oy[..., 0][()])
+
+# solves graphic statics for length L, positions xs, and forces Fs for 
+# every horizontal force in Hs at once. Oy does not depend on H and the 
+# form scales as 1/H, so one solve is broadcast over Hs. Returns tuple 
+# of 2-D arrays (form ys, internal force magnitudes), one row per H
+def solveH(L, xs, Fs, Hs):
+    Hs = np.asarray(Hs, dtype=float)[:, np.newaxis]
+    formYs, downYs, testYs, Oy = solve(L, xs, Fs, 1.)
+    ys = formYs[np.newaxis, :] / Hs
+    forces = np.hypot(Hs, (downYs - Oy)[np.newaxis, :])
+    return (ys, forces)
 
 class GraphicStatics:
 
@@ -25,9 +50,8 @@ class GraphicStatics:
     # forces, and H is horizontal force in arch
     def __init__(self, L, xs, Fs, H):
         self._L = L
-        self._xs = deepcopy(xs)
-        self._xs.append(L)
-        self._Fs = deepcopy(Fs)
+        self._xs = np.append(xs, L)
+        self._Fs = np.asarray(Fs, dtype=float)
         self._H = H
         self._forceDiagram = ForceDiagram(self._Fs, H)
         self._graphicStatics()
@@ -37,20 +61,16 @@ class GraphicStatics:
     # returns a form diagram using the force diagram
     def _forceToForm(self):
         o = self._forceDiagram.getO()
-        forceCoords = self._forceDiagram.getDownCoords()
-        formCoords = [Vector()]
-        for i in range(len(self._xs)):
-            forceVect = o - forceCoords[i]
-            formY = forceVect.intersect(formCoords[i], self._xs[i])
-            formCoords.append(Vector(self._xs[i], formY))
-        return formCoords
+        forceYs = self._forceDiagram.getDownCoords().ys()
+        xs = np.concatenate(([0.], self._xs))
+        ys = _formYs(np.diff(xs), forceYs, o.x(), o.y())
+        return Polyline.fromXYZ(xs, ys)
 
     # returns the coordinates of the test form
     def _testForm(self):
         assert self._forceDiagram.isTest()
         self._testFormCoords = self._forceToForm()
-        length = len(self._testFormCoords)
-        return self._testFormCoords[length-1] - self._testFormCoords[0]
+        return self._testFormCoords[-1] - self._testFormCoords[0]
 
     # gets final force diagram and form diagram coordinates
     def _graphicStatics(self):
@@ -74,11 +94,11 @@ class GraphicStatics:
     def getL(self):
         return self._L
 
-    # returns list of positions where forces are applied
+    # returns array of positions where forces are applied
     def getXs(self):
         return self._xs
 
-    # returns list of applied force magnitudes
+    # returns array of applied force magnitudes
     def getFs(self):
         return self._Fs
 
@@ -90,19 +110,79 @@ class GraphicStatics:
     def isXY(self):
         return self._xy
 
-    # translates force and form diagrams from xy-plane to xz-plane
-    def xytoxz(self):
+    # returns graphic statics with force and form diagrams projected 
+    # from xy-plane to xz-plane, self is not changed
+    def toXZ(self):
         assert self._xy
         assert self._forceDiagram.isXY()
-        for i in range(len(self._formCoords)):
-            self._formCoords[i].xytoxz()
-        for i in range(len(self._testFormCoords)):
-            self._testFormCoords[i].xytoxz()
-        self._forceDiagram.xytoxz()
-        self._xy = False
+        xz = copy(self)
+        xz._formCoords = self._formCoords.toXZ()
+        xz._testFormCoords = self._testFormCoords.toXZ()
+        xz._forceDiagram = self._forceDiagram.toXZ()
+        xz._xy = False
+        return xz
 
     # returns height of form
     def getHeight(self):
-        return _maxy(self._formCoords) - _miny(self._formCoords)
+        ys = self._formCoords.ys()
+        return ys.max() - ys.min()
 
+class GraphicStaticsCases:
 
+    # creates GraphicStaticsCases object for length L, positions xs, and
+    # horizontal force H with a load case for each row of the 2-D array
+    # Fs. All the cases are solved together with solve, case(k) builds
+    # the GraphicStatics object of case k when it is needed.
+    def __init__(self, L, xs, Fs, H):
+        self._L = L
+        self._xs = np.append(xs, L)
+        self._Fs = np.atleast_2d(np.asarray(Fs, dtype=float))
+        self._H = H
+        formYs, downYs, testYs, Oy = solve(L, xs, self._Fs, H)
+        self._formYs = formYs
+        self._downYs = downYs
+        self._Oys = np.atleast_1d(Oy)
+
+    # returns number of load cases
+    def cases(self):
+        return len(self._Fs)
+
+    # returns GraphicStatics object of load case k
+    def case(self, k):
+        return GraphicStatics(self._L, self._xs[:-1], self._Fs[k], self._H)
+
+    # returns length
+    def getL(self):
+        return self._L
+
+    # returns array of positions where forces are applied
+    def getXs(self):
+        return self._xs
+
+    # returns 2-D array of applied forces, one row per case
+    def getFs(self):
+        return self._Fs
+
+    # returns horizontal force in arch
+    def getH(self):
+        return self._H
+
+    # returns 2-D array of form y-coordinates, one row per case (the
+    # x-coordinates are 0 and getXs())
+    def getFormYs(self):
+        return self._formYs
+
+    # returns 2-D array of y-coordinates of the applied forces in the 
+    # force diagrams, one row per case
+    def getDownYs(self):
+        return self._downYs
+
+    # returns array of y-coordinates of O, one per case
+    def getOys(self):
+        return self._Oys
+
+    # returns 2-D array of the reactions at the start and end of the 
+    # form, one row per case
+    def getReactions(self):
+        top = self._downYs[:, -1]
+        return np.column_stack((self._Oys, top - self._Oys))
@@ -0,0 +1,135 @@
+import numpy as np
+
+class InfluenceLines:
+
+    # creates InfluenceLines object for Bridge bridge. A unit load acts
+    # downward on the deck (like q) at a node and is carried to the arch
+    # by that node's cable, whose direction is fixed by the geometry. A
+    # load between nodes is shared by the two nodes in proportion to
+    # its distance from each. The lines are found once for all the
+    # interior nodes:
+    # 'cable force' - force in each cable, which only a load at its own
+    #     node changes, so it is kept as a vector of those responses
+    # 'deck moment' - deck moment at each interior node, with the same
+    #     statics as Bridge.getDeckMomentZ
+    # 'reactions' - arch reactions (R1y, R1z, R2y, R2z), not including
+    #     the weight of the arch
+    def __init__(self, bridge):
+
+        deck = bridge.getDeck().array()
+        arch = bridge.getArch().array()
+        xs = deck[:, 0].copy()
+        L = xs[-1] - xs[0]
+        X = xs[1:-1]
+
+        # y force in each cable per unit of vertical force
+        cables = (deck - arch)[1:-1]
+        ry = cables[:, 1] / cables[:, 2]
+
+        V = -ry - X * np.abs(ry) / L
+        M = np.outer(X - xs[0], V) + \
+            ry * np.maximum(X[:, np.newaxis] - X[np.newaxis, :], 0.)
+
+        R1 = (xs[-1] - X) / L
+        R2 = (X - xs[0]) / L
+
+        self._xs = xs
+        self._deckLens = bridge.getDeck().lengths()
+        self._lines = {'cable force': np.sqrt(ry**2 + 1.),
+                       'deck moment': M,
+                       'reactions': np.vstack((R1 * ry, R1, R2 * ry, R2))}
+        for a in self._lines.values():
+            a.setflags(write=False)
+
+    # returns list of x-coordinates of nodes
+    def getXs(self):
+        return self._xs.tolist()
+
+    # returns list of names of influence lines
+    def names(self):
+        return sorted(self._lines.keys())
+
+    # returns read-only array of influence line name as kept, a vector
+    # of responses to a unit load at each location's own node or an
+    # array where row i is the response at location i and column j the
+    # response to a unit load at interior node j
+    def _line(self, name):
+        if name not in self._lines:
+            raise Exception('unknown influence line ' + str(name))
+        return self._lines[name]
+
+    # returns array of influence line name, row i is the response at 
+    # location i and column j the response to a unit load at interior
+    # node j
+    def line(self, name):
+        a = self._line(name)
+        if a.ndim == 1:
+            return np.diag(a)
+        return a
+
+    # returns array of responses name to loads at the interior nodes, 
+    # one row of nodeLoads (and of the result) per arrangement
+    def nodeResponse(self, name, nodeLoads):
+        a = self._line(name)
+        if a.ndim == 1:
+            return nodeLoads * a
+        return np.dot(nodeLoads, a.T)
+
+    # returns array (len(positions) x interior nodes) that shares a
+    # unit load at each x-coordinate in positions between the nodes,
+    # loads off the deck or on the end nodes do not reach the arch
+    def weights(self, positions):
+
+        xs = self._xs
+        p = np.asarray(positions, dtype=float).ravel()
+        n = len(xs)
+        i = np.clip(np.searchsorted(xs, p, 'right') - 1, 0, n - 2)
+        t = (p - xs[i]) / (xs[i+1] - xs[i])
+        on = (p >= xs[0]) & (p <= xs[-1])
+
+        W = np.zeros((len(p), n))
+        rows = np.arange(len(p))
+        W[rows, i] = np.where(on, 1. - t, 0.)
+        W[rows, i+1] = np.where(on, t, 0.)
+        return W[:, 1:-1]
+
+    # returns array of influence line name at load x-coordinates
+    # positions, row i is the response at location i
+    def at(self, name, positions):
+        return self.nodeResponse(name, self.weights(positions)).T
+
+    # returns array of responses name to groups of point loads, where
+    # positions is S x A array of x-coordinates of A loads with
+    # magnitudes loads in each of S arrangements, row s is the response
+    # to arrangement s
+    def response(self, name, positions, loads):
+        positions = np.atleast_2d(np.asarray(positions, dtype=float))
+        S, A = positions.shape
+        W = self.weights(positions).reshape(S, A, -1)
+        nodeLoads = np.einsum('sam,a->sm', W, np.asarray(loads, float))
+        return self.nodeResponse(name, nodeLoads)
+
+    # returns tuple (mins, maxs) of arrays of the smallest and largest
+    # response name to a train of point loads loads at distances
+    # offsets behind the front load, as it moves across the deck. The
+    # front load takes steps + 1 equally spaced positions from the start
+    # of the deck until the whole train has left it.
+    def trainEnvelope(self, name, offsets, loads, steps=200):
+        offsets = np.asarray(offsets, dtype=float)
+        start = self._xs[0]
+        end = self._xs[-1] + offsets.max()
+        fronts = np.linspace(start, end, steps + 1)
+        r = self.response(name, fronts[:, np.newaxis] - offsets, loads)
+        return (r.min(axis=0), r.max(axis=0))
+
+    # returns tuple (mins, maxs) of arrays of the smallest and largest
+    # response name to a uniform load w (per deck length, like q) on
+    # any part of the deck. The load on each node's tributary deck
+    # length is placed where it increases (or decreases) the response.
+    def patchEnvelope(self, name, w):
+        tribL = (self._deckLens[:-1] + self._deckLens[1:]) / 2.
+        r = self._line(name) * (w * tribL)
+        if r.ndim == 1:
+            return (np.minimum(r, 0.), np.maximum(r, 0.))
+        return (np.minimum(r, 0.).sum(axis=1),
+                np.maximum(r, 0.).sum(axis=1))
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+class LRUCache:
+
+    # creates empty cache that holds at most maxSize items, dropping the
+    # least recently used item when it is full
+    def __init__(self, maxSize=1024):
+        self._items = OrderedDict()
+        self._maxSize = maxSize
+        self._hits = 0
+        self._misses = 0
+
+    # returns value stored with key and marks it as recently used, 
+    # returns default if key is not stored
+    def get(self, key, default=None):
+        if key in self._items:
+            value = self._items.pop(key)
+            self._items[key] = value
+            self._hits += 1
+            return value
+        self._misses += 1
+        return default
+
+    # stores value with key, dropping least recently used items if full
+    def put(self, key, value):
+        if key in self._items:
+            del self._items[key]
+        self._items[key] = value
+        while len(self._items) > self._maxSize:
+            self._items.popitem(last=False)
+
+    # returns True if key is stored, does not count as a hit or miss
+    def __contains__(self, key):
+        return key in self._items
+
+    # returns number of stored items
+    def __len__(self):
+        return len(self._items)
+
+    # changes the maximum number of items, dropping items if needed
+    def resize(self, maxSize):
+        self._maxSize = maxSize
+        while len(self._items) > self._maxSize:
+            self._items.popitem(last=False)
+
+    # removes items whose key satisfies match, or all items if match is 
+    # None, and returns the number removed
+    def invalidate(self, match=None):
+        if match is None:
+            keys = list(self._items.keys())
+        else:
+            keys = filter(match, self._items.keys())
+        for key in keys:
+            del self._items[key]
+        return len(keys)
+
+    # returns dictionary of hits, misses, size, and maxSize
+    def info(self):
+        return {'hits': self._hits, 'misses': self._misses, 
+                'size': len(self._items), 'maxSize': self._maxSize}
+
+    # resets hit and miss counts
+    def resetInfo(self):
+        self._hits = 0
+        self._misses = 0
@@ -0,0 +1,115 @@
+import numpy as np
+from polyline import Polyline
+
+# returns product of 2 x 2 matrices a and b given as nested lists
+def _mul(a, b):
+    return [[a[0][0]*b[0][0] + a[0][1]*b[1][0], 
+             a[0][0]*b[0][1] + a[0][1]*b[1][1]],
+            [a[1][0]*b[0][0] + a[1][1]*b[1][0], 
+             a[1][0]*b[0][1] + a[1][1]*b[1][1]]]
+
+# returns product of 2 x 2 matrix a and 2-vector v
+def _mulv(a, v):
+    return [a[0][0]*v[0] + a[0][1]*v[1], a[1][0]*v[0] + a[1][1]*v[1]]
+
+# returns inverse of 2 x 2 matrix a minus 2 x 2 matrix b
+def _invsub(a, b):
+    a00 = a[0][0] - b[0][0]
+    a01 = a[0][1] - b[0][1]
+    a10 = a[1][0] - b[1][0]
+    a11 = a[1][1] - b[1][1]
+    det = a00 * a11 - a01 * a10
+    return [[a11 / det, -a01 / det], [-a10 / det, a00 / det]]
+
+# solves block tridiagonal system with 2 x 2 blocks where lower[i],
+# diag[i], and upper[i] multiply the unknowns of nodes i-1, i, and i+1
+# in row i, returns m x 2 array of unknowns for m x 2 array rhs. The 
+# block Thomas algorithm runs on nested lists since the blocks are too
+# small for numpy to be faster.
+def solveBlockTridiagonal(lower, diag, upper, rhs):
+
+    lower = lower.tolist()
+    diag = diag.tolist()
+    upper = upper.tolist()
+    rhs = rhs.tolist()
+    m = len(diag)
+    zero = [[0., 0.], [0., 0.]]
+    cs = [zero]
+    ds = [[0., 0.]]
+
+    for i in range(m):
+        inv = _invsub(diag[i], _mul(lower[i], cs[i]))
+        cs.append(_mul(inv, upper[i]))
+        lds = _mulv(lower[i], ds[i])
+        ds.append(_mulv(inv, [rhs[i][0] - lds[0], rhs[i][1] - lds[1]]))
+
+    x = [None] * m
+    x[m-1] = ds[m]
+    for i in range(m - 2, -1, -1):
+        cx = _mulv(cs[i+1], x[i+1])
+        x[i] = [ds[i+1][0] - cx[0], ds[i+1][1] - cx[1]]
+    return np.array(x)
+
+# returns tuple (residual, lower, diag, upper) of the funicular equations
+# for arch with x coordinates xs and y and z coordinates ys and zs
+# hanging from deck coordinates deckCoords with H, q, and qArch. The
+# residual of interior node i in the xy- and xz-planes is
+# H * (change in slope at i) + applied force at i, which is zero for
+# the funicular form. The Jacobian is block tridiagonal because the
+# applied forces depend only on node i and its neighbours.
+def system(xs, ys, zs, deckCoords, H, q, qArch):
+
+    deckCoords = Polyline(deckCoords)
+    deckLens = deckCoords.lengths()
+    P = q * ((deckLens[:-1] + deckLens[1:])/2.0)
+    u = ys[1:-1] - deckCoords.ys()[1:-1]
+    w = zs[1:-1] - deckCoords.zs()[1:-1]
+
+    dxs = np.diff(xs)
+    dys = np.diff(ys)
+    dzs = np.diff(zs)
+    archLens = np.sqrt(dxs**2 + dys**2 + dzs**2)
+    ey = dys / archLens
+    ez = dzs / archLens
+
+    FsXY = u * P / w
+    FsXZ = P + qArch * ((archLens[:-1] + archLens[1:])/2.0)
+    sy = dys / dxs
+    sz = dzs / dxs
+    residual = np.column_stack((H * (sy[1:] - sy[:-1]) + FsXY,
+                                H * (sz[1:] - sz[:-1]) + FsXZ))
+
+    kl = H / dxs[:-1]
+    ku = H / dxs[1:]
+    h = qArch / 2.
+    m = len(P)
+
+    lower = np.zeros((m, 2, 2))
+    lower[:, 0, 0] = kl
+    lower[:, 1, 0] = -h * ey[:-1]
+    lower[:, 1, 1] = kl - h * ez[:-1]
+
+    diag = np.empty((m, 2, 2))
+    diag[:, 0, 0] = -kl - ku + P / w
+    diag[:, 0, 1] = -u * P / w**2
+    diag[:, 1, 0] = h * (ey[:-1] - ey[1:])
+    diag[:, 1, 1] = -kl - ku + h * (ez[:-1] - ez[1:])
+
+    upper = np.zeros((m, 2, 2))
+    upper[:, 0, 0] = ku
+    upper[:, 1, 0] = h * ey[1:]
+    upper[:, 1, 1] = ku + h * ez[1:]
+
+    return (residual, lower, diag, upper)
+
+# returns arch y and z coordinates after one Newton step of the
+# funicular equations from ys and zs, the arguments are as in system
+def step(xs, ys, zs, deckCoords, H, q, qArch):
+    residual, lower, diag, upper = system(xs, ys, zs, deckCoords, H, q,
+                                          qArch)
+    delta = solveBlockTridiagonal(lower, diag, upper, -residual)
+    ys = ys.copy()
+    zs = zs.copy()
+    ys[1:-1] += delta[:, 0]
+    zs[1:-1] += delta[:, 1]
+    return (ys, zs)
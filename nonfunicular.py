@@ -9,6 +9,7 @@ def parabolicArch(L, d, h):
     az = h / ((L/2.)**2)
     parabola = lambda x, a: a * (-(x - L/2.)**2 + (L/2.)**2)
     arch = lambda x: Vector(x, parabola(x, ay), parabola(x, az))
+    arch.key = ('parabolic', float(L), float(d), float(h))
     return arch
 
 def parabArchPolar(L, angle, r):
@@ -16,6 +17,17 @@ def parabArchPolar(L, angle, r):
     h = r * math.sin(angle)
     return parabolicArch(L, d, h)
 
+# returns hashable identity of arch: its parameters for arches made by
+# parabolicArch or parabArchPolar and the function itself otherwise
+def archKey(arch):
+    return getattr(arch, 'key', arch)
+
+# returns arch with identity key made by archKey, which must come from
+# parabolicArch or parabArchPolar
+def archFromKey(key):
+    if type(key) == tuple and key[0] == 'parabolic':
+        return parabolicArch(*key[1:])
+    raise Exception("arch cannot be rebuilt from its key")
 
 
 def getArchCoords(arch, L, segments):
@@ -1,6 +1,8 @@
 import fromdeck
+from lrucache import LRUCache
 from vector import Vector
 from bridge import Bridge
+import numpy as np
 import math
 
 # Optimization function, returns Bridge deck defined by deck function, 
@@ -26,16 +28,18 @@ def optGlob(deck, L, q, qArch, segs, func, isArch=None, H=None, anchOff=None):
             minB = None
             minBVal = float('inf')
             minBH = None
+            b = None
             Hmin = startHmin
             Hmax = startHmax
 
             while step > 0.001:
                 H = Hmin + step
                 while H < Hmax:
-                    b = fromdeck.fromDeck(deck, L, anchOff, H, q, 
-                                                qArch, segs)
-                    if func(b) < minBVal:
-                        minBVal = func(b)
+                    b = fromdeck.cachedFromDeck(deck, L, anchOff, H, q, 
+                                                qArch, segs, start=b)
+                    val = func(b)
+                    if val < minBVal:
+                        minBVal = val
                         minB = b
                         minBH = H
                     H += step
@@ -58,16 +62,18 @@ def optGlob(deck, L, q, qArch, segs, func, isArch=None, H=None, anchOff=None):
             minB = None
             minBVal = float('inf')
             minBAO = None
+            b = None
             AOmin = startAOmin
             AOmax = startAOmax
 
             while step > 0.001:
                 AO = AOmin + step
                 while AO < AOmax:
-                    b = fromdeck.fromDeck(deck, L, AO, H, q, qArch, 
-                                            segs)
-                    if func(b) < minBVal:
-                        minBVal = func(b)
+                    b = fromdeck.cachedFromDeck(deck, L, AO, H, q, 
+                                            qArch, segs, start=b)
+                    val = func(b)
+                    if val < minBVal:
+                        minBVal = val
                         minB = b
                         minBAO = AO
                     AO += step
@@ -86,26 +92,345 @@ def optGlob(deck, L, q, qArch, segs, func, isArch=None, H=None, anchOff=None):
     except Exception as e:
         print e
 
+# returns tuple (f, evals) where f(anchOff, H) is func of the funicular
+# bridge for that design (infinity if it cannot be found or its form 
+# finding did not converge) and evals() is the number of calls to f so
+# far. Each form finding starts from the previous converged bridge and
+# goes through fromdeck.cachedFromDeck.
+def _objective(deck, L, q, qArch, segs, func):
+
+    count = [0]
+    last = [None]
+
+    def f(anchOff, H):
+        count[0] += 1
+        if H == 0.:
+            return float('inf')
+        try:
+            bridge, i, res, converged = fromdeck.cachedFromDeck(
+                    deck, L, anchOff, H, q, qArch, segs, start=last[0], 
+                    info=True)
+            if not converged:
+                return float('inf')
+            last[0] = bridge
+            val = func(bridge)
+        except Exception:
+            return float('inf')
+        if math.isnan(val):
+            return float('inf')
+        return val
+
+    return (f, lambda: count[0])
+
+# golden ratio used to grow brackets
+_GOLD = (1. + math.sqrt(5.)) / 2.
+
+# returns tuple (a, b, c, fb, status) where f(b) <= f(a) and 
+# f(b) <= f(c), found by walking downhill from x0 and x1 in steps that 
+# grow by the golden ratio and stay within [lo, hi]. status is 
+# 'bracket' if the minimum is bracketed, 'limit' if the walk reaches a 
+# bound (b is the bound), or 'budget' if evals() reaches maxEval first
+# (b is the best point so far). c equals b unless status is 'bracket'.
+def _bracket(f, x0, x1, lo, hi, maxEval, evals):
+    a, b = x0, x1
+    fa, fb = f(a), f(b)
+    if fb > fa:
+        a, b = b, a
+        fa, fb = fb, fa
+    while True:
+        if evals() >= maxEval:
+            return (a, b, b, fb, 'budget')
+        bound = hi if b > a else lo
+        c = b + _GOLD * (b - a)
+        if (c - bound) * (b - a) >= 0.:
+            c = bound
+        fc = f(c)
+        if fc >= fb:
+            return (a, b, c, fb, 'bracket')
+        if c == bound:
+            return (b, c, c, fc, 'limit')
+        a, b = b, c
+        fa, fb = fb, fc
+
+# minimizes f on the bracket (a, b, c) with Brent's method (parabolic 
+# interpolation with golden-section steps as fallback) to within xtol, 
+# stopping after evals()[0] reaches maxEval. Returns tuple 
+# (x, f(x), converged).
+def _brent(f, a, b, c, fb, xtol, maxEval, evals):
+
+    cgold = 1. - 1. / _GOLD
+    lo, hi = min(a, c), max(a, c)
+    x = w = v = b
+    fx = fw = fv = fb
+    d = e = 0.
+
+    while evals() < maxEval:
+
+        xm = 0.5 * (lo + hi)
+        if abs(x - xm) <= 2. * xtol - 0.5 * (hi - lo):
+            return (x, fx, True)
+
+        golden = True
+        if abs(e) > xtol:
+            r = (x - w) * (fx - fv)
+            p = (x - v) * (fx - fw)
+            q = 2. * (p - r)
+            p = (x - v) * p - (x - w) * r
+            if q > 0.:
+                p = -p
+            q = abs(q)
+            if abs(p) < abs(0.5 * q * e) and q * (lo - x) < p < q * (hi - x):
+                e = d
+                d = p / q
+                golden = False
+                if (x + d) - lo < 2. * xtol or hi - (x + d) < 2. * xtol:
+                    d = xtol if xm >= x else -xtol
+        if golden:
+            e = lo - x if x >= xm else hi - x
+            d = cgold * e
+
+        if abs(d) >= xtol:
+            u = x + d
+        else:
+            u = x + (xtol if d >= 0. else -xtol)
+        fu = f(u)
+
+        if fu <= fx:
+            if u >= x:
+                lo = x
+            else:
+                hi = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        else:
+            if u < x:
+                lo = u
+            else:
+                hi = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v = u
+                fv = fu
+
+    return (x, fx, False)
+
+# Optimization function like optGlob (same arguments) that brackets the
+# minimum of func(bridge) and refines it with Brent's method, using at 
+# most maxEval form findings and stopping when the changing variable is
+# known to within xtol (the bracketing evaluations count towards 
+# maxEval). Designs whose form finding does not converge are never 
+# chosen. Returns dictionary with keys 'bridge', 'x' (the
+# optimal H or anchor offset), 'value', 'evaluations', 'converged', 
+# 'formConverged' (whether the form finding of the optimum converged),
+# and 'status' ('converged', 'limit' if the minimum is at the edge of 
+# the search range, 'budget' if maxEval was reached, or 'unconverged' 
+# if no design with a converged form finding was found).
+def optBrent(deck, L, q, qArch, segs, func, isArch=None, H=None, 
+             anchOff=None, xtol=.01, maxEval=100):
+
+    if H is None:
+        if isArch:
+            lo, hi = 0., q * 10000
+        else:
+            lo, hi = -q * 10000, 0.
+        x0, x1 = hi / 100., hi / 50.
+        if not isArch:
+            x0, x1 = lo / 100., lo / 50.
+        design = lambda x: (anchOff, x)
+    elif anchOff is None:
+        dDeck = fromdeck.getDeckDepth(deck, L)
+        lo, hi = -dDeck * 2, dDeck * 2
+        x0, x1 = 0., dDeck / 2.
+        design = lambda x: (x, H)
+    else:
+        raise Exception('exactly one of H and anchOff must be None')
+
+    objective, evals = _objective(deck, L, q, qArch, segs, func)
+    f = lambda x: objective(*design(x))
+
+    a, b, c, fb, status = _bracket(f, x0, x1, lo, hi, maxEval, evals)
+    if status != 'bracket':
+        x, fx, converged = b, fb, False
+    else:
+        x, fx, converged = _brent(f, a, b, c, fb, xtol, maxEval, evals)
+        status = 'converged' if converged else 'budget'
+
+    ao, h = design(x)
+    bridge, i, res, formConverged = fromdeck.cachedFromDeck(
+            deck, L, ao, h, q, qArch, segs, info=True)
+    if not formConverged:
+        converged = False
+        status = 'unconverged'
+    return {'bridge': bridge, 'x': x, 'value': fx, 
+            'evaluations': evals(), 'converged': converged, 
+            'formConverged': formConverged, 'status': status}
+
+# returns search ranges ((Hmin, Hmax), (AOmin, AOmax)) for deck with 
+# function deck and length L under load q, the same ranges optGlob 
+# searches. isArch is True if H > 0.
+def optBounds(deck, L, q, isArch=True):
+    dDeck = fromdeck.getDeckDepth(deck, L)
+    if isArch:
+        Hs = (0., q * 10000)
+    else:
+        Hs = (-q * 10000, 0.)
+    return (Hs, (-dDeck * 2, dDeck * 2))
+
+# minimizes f over points x (numpy arrays) in the box bounds (list of 
+# (min, max) pairs) with the Nelder-Mead simplex method, starting from
+# x0 with initial steps steps. Trial points are moved into the box. 
+# Stops when every vertex is within xtol of the best one in each 
+# coordinate and their values are within ftol (relative) of the best, 
+# or when evals() reaches maxEval. Returns tuple (x, f(x), converged).
+def _nelderMead(f, x0, steps, bounds, xtol, ftol, maxEval, evals):
+
+    lo = np.array([b[0] for b in bounds])
+    hi = np.array([b[1] for b in bounds])
+    clip = lambda x: np.minimum(np.maximum(x, lo), hi)
+
+    x0 = clip(np.asarray(x0, dtype=float))
+    simplex = [x0]
+    for i in range(len(x0)):
+        x = x0.copy()
+        x[i] += steps[i]
+        if x[i] > hi[i]:
+            x[i] = x0[i] - steps[i]
+        simplex.append(clip(x))
+    values = map(f, simplex)
+
+    while True:
+
+        order = np.argsort(values)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+        best = simplex[0]
+        spread = max(np.abs(x - best).max() for x in simplex[1:])
+        fspread = abs(values[-1] - values[0])
+        if spread <= xtol and fspread <= ftol * (abs(values[0]) + 1e-12):
+            return (best, values[0], True)
+        if evals() >= maxEval:
+            return (best, values[0], False)
+
+        centroid = np.mean(simplex[:-1], axis=0)
+        worst = simplex[-1]
+        xr = clip(centroid + (centroid - worst))
+        fr = f(xr)
+
+        if fr < values[0]:
+            xe = clip(centroid + 2. * (centroid - worst))
+            fe = f(xe)
+            if fe < fr:
+                simplex[-1], values[-1] = xe, fe
+            else:
+                simplex[-1], values[-1] = xr, fr
+        elif fr < values[-2]:
+            simplex[-1], values[-1] = xr, fr
+        else:
+            if fr < values[-1]:
+                xc = clip(centroid + 0.5 * (xr - centroid))
+            else:
+                xc = clip(centroid + 0.5 * (worst - centroid))
+            fc = f(xc)
+            if fc < min(fr, values[-1]):
+                simplex[-1], values[-1] = xc, fc
+            else:
+                for i in range(1, len(simplex)):
+                    simplex[i] = clip(best + 0.5 * (simplex[i] - best))
+                    values[i] = f(simplex[i])
+
+# Optimization function that changes H and anchor offset together to 
+# minimize func(bridge) for deck function deck and parameters L, q, 
+# qArch, and segs with the Nelder-Mead method. isArch is True if H > 0.
+# H0 and anchOff0 are the starting design (by default from the size of
+# the search range) and bounds is ((Hmin, Hmax), (AOmin, AOmax)), by 
+# default optBounds. Stops when H and anchor offset are known to within
+# xtol and func to within ftol (relative), or after maxEval form 
+# findings. Designs whose form finding does not converge are never 
+# chosen. Returns dictionary with keys 'bridge', 'H', 'anchOff', 
+# 'value', 'evaluations', 'converged', 'formConverged' (whether the form
+# finding of the optimum converged), and 'status' ('converged', 
+# 'budget', or 'unconverged' if no design with a converged form finding
+# was found).
+def optJoint(deck, L, q, qArch, segs, func, isArch=True, H0=None, 
+             anchOff0=None, bounds=None, xtol=.1, ftol=1e-4, 
+             maxEval=200):
+
+    if bounds is None:
+        bounds = optBounds(deck, L, q, isArch)
+    Hs, AOs = bounds
+    HScale = max(abs(Hs[0]), abs(Hs[1])) / 50.
+    if H0 is None:
+        H0 = HScale if isArch else -HScale
+    if anchOff0 is None:
+        anchOff0 = AOs[1] / 8.
+
+    objective, evals = _objective(deck, L, q, qArch, segs, func)
+    f = lambda x: objective(x[1], x[0])
+    steps = (abs(H0) / 2., (AOs[1] - AOs[0]) / 16.)
+    x, fx, converged = _nelderMead(f, (H0, anchOff0), steps, bounds, 
+                                   xtol, ftol, maxEval, evals)
+
+    bridge, i, res, formConverged = fromdeck.cachedFromDeck(
+            deck, L, x[1], x[0], q, qArch, segs, info=True)
+    status = 'converged' if converged else 'budget'
+    if not formConverged:
+        converged = False
+        status = 'unconverged'
+    return {'bridge': bridge, 'H': x[0], 'anchOff': x[1], 'value': fx, 
+            'evaluations': evals(), 'converged': converged, 
+            'formConverged': formConverged, 'status': status}
+
+# functions of Objective o and bridge x for each built-in optimization
+# input function, and whether it has minimums when anchor offset and 
+# when H change
+_objectives = {
+    'cable force': (lambda o, x: x.maxCableForce(o.q), True, False),
+    'arch force': (lambda o, x: x.maxArchForce(), True, True),
+    'y react': (lambda o, x: abs(x.getArchReactions(o.qArch)[0].y()), 
+                    True, False),
+    'z react': (lambda o, x: abs(x.getArchReactions(o.qArch)[0].z()), 
+                    True, False),
+    'arch height': (lambda o, x: x.archHeight(), True, False),
+    'arch depth': (lambda o, x: x.archDepth(), True, False),
+    'arch radial length': (lambda o, x: x.archRadius(), True, False),
+    'deck moment': (lambda o, x: x.maxDeckMomentZ(o.q), True, False),
+    'axial force': 
+            (lambda o, x: max(x.maxCableForce(o.q), x.maxArchForce()), 
+                True, True),
+    'load path': (lambda o, x: x.loadPath(o.q, o.sigArch, o.sigCab), 
+                    True, True),
+    'select arch height': (lambda o, x: abs(o.h - x.archHeight()), 
+                            True, True)}
+
+class Objective:
+
+    # creates optimization input function identified by string name 
+    # with its inputs. Unlike a lambda it can be pickled, so it can be 
+    # sent to other processes.
+    def __init__(self, name, q=None, qArch=None, sigArch=1., sigCab=1., 
+                 h=None):
+        if name not in _objectives:
+            raise Exception('unknown optimization function ' + str(name))
+        self.name = name
+        self.q = q
+        self.qArch = qArch
+        self.sigArch = sigArch
+        self.sigCab = sigCab
+        self.h = h
+
+    # returns value of the input function for bridge x
+    def __call__(self, x):
+        return _objectives[self.name][0](self, x)
+
 # returns dictionary of optimization input functions, input is required
 # for functions that include those variables.
 def optDict(q=None, qArch=None, sigArch=1., sigCab=1., h=None):
-    d = {'cable force': (lambda x: x.maxCableForce(q), True, False),
-          'arch force': (lambda x: x.maxArchForce(), True, True),
-          'y react': (lambda x: abs(x.getArchReactions(qArch)[0].y()), 
-                        True, False),
-          'z react': (lambda x: abs(x.getArchReactions(qArch)[0].z()), 
-                        True, False),
-          'arch height': (lambda x: x.archHeight(), True, False),
-          'arch depth': (lambda x: x.archDepth(), True, False),
-          'arch radial length': (lambda x: x.archRadius(), True, False),
-          'deck moment': (lambda x: x.maxDeckMomentZ(q), True, False),
-          'axial force': 
-                (lambda x: max(x.maxCableForce(q), x.maxArchForce()), 
-                    True, True),
-          'load path': (lambda x: x.loadPath(q, sigArch, sigCab), 
-                            True, True),
-          'select arch height': (lambda x: abs(h - x.archHeight()), 
-                                    True, True)}
+    d = {}
+    for s, t in _objectives.items():
+        f = Objective(s, q, qArch, sigArch, sigCab, h)
+        d[s] = (f, t[1], t[2])
     return d
 
 # returns list of input functions that have minimums for whichever of 
@@ -124,24 +449,58 @@ def optFunc(s, q=None, qArch=None, sigArch=1., sigCab=1., h=None):
     d = optDict(q, qArch, sigArch, sigCab, h)
     return d[s][0]
 
-# runs optimization for all the built-in input functions and for each
-# changing variable and returns a dictionary of results
-def optAll(deck, L, q, qArch, segs, H, anchOff, h):
+# runs optGlob for job (deck, L, q, qArch, segs, objective, t, H, 
+# anchOff), where t is 'AO' or 'H' (the changing variable) and deck is 
+# the deck or its fromdeck.deckKey. The job runs with its own empty 
+# form-finding cache, so the result does not depend on which jobs ran 
+# before it, and the caller's cache is put back afterwards.
+def _optJob(job):
+    deck, L, q, qArch, segs, func, t, H, anchOff = job
+    old = fromdeck.useCache(LRUCache(fromdeck.cacheInfo()['maxSize']))
+    try:
+        if type(deck) == tuple:
+            deck = fromdeck.deckFromKey(deck)
+        if t == 'AO':
+            return optGlob(deck, L, q, qArch, segs, func, H=H)
+        return optGlob(deck, L, q, qArch, segs, func, H > 0., 
+                       anchOff=anchOff)
+    finally:
+        fromdeck.useCache(old)
 
-    if H > 0.: isArch = True
-    else: isArch = False
+# runs optimization for all the built-in input functions and for each
+# changing variable and returns a dictionary of results. If workers is 
+# more than 1 the searches run in a pool of that many processes (deck 
+# must then be made by parabolicDeck or sineDeck, or be a list).
+def optAll(deck, L, q, qArch, segs, H, anchOff, h, workers=1):
 
     optD = optDict(q, qArch, h=h)
+    if workers > 1:
+        deck = fromdeck.deckKey(deck)
+        if not isinstance(deck, tuple):
+            raise Exception("deck cannot be sent to other processes")
+
     d = {}
-    for s, c in optD.items():
+    jobs = []
+    for s in sorted(optD.keys()):
         d[s] = {}
-        opt = c[0]
-        if c[1]: 
-            d[s]['AO'] = optGlob(deck, L, q, qArch, segs, opt, H=H)
-        if c[2]:
-            d[s]['H'] = optGlob(deck, L, q, qArch, segs, opt, isArch, 
-                                    anchOff=anchOff)
-    
+        c = optD[s]
+        for t, ok in (('AO', c[1]), ('H', c[2])):
+            if ok:
+                jobs.append((deck, L, q, qArch, segs, c[0], t, H, anchOff))
+
+    if workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        try:
+            results = pool.map(_optJob, jobs, 1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(_optJob, jobs)
+
+    for job, b in zip(jobs, results):
+        d[job[5].name][job[6]] = b
     return d
 
 # prints value of changing variable for bridge b and variable 
@@ -160,4 +519,159 @@ def printOpts(d):
         print s
         for t, b in ts.items():
             if b != None:
-                print t + "=" + _printInd(t, b)
\ No newline at end of file
+                print t + "=" + _printInd(t, b)
+
+# returns boolean array marking the rows of N x k array F (objective 
+# values, smaller is better) that no other row dominates
+def nonDominated(F):
+    F = np.asarray(F, dtype=float)
+    le = np.all(F[:, np.newaxis] <= F[np.newaxis, :], axis=2)
+    lt = np.any(F[:, np.newaxis] < F[np.newaxis, :], axis=2)
+    return ~np.any(le & lt, axis=0)
+
+# returns tuple (ranks, crowding) for objective values F, where ranks[i]
+# is the Pareto front of row i (0 is non-dominated) and crowding[i] is 
+# its crowding distance within its front (infinite at the ends)
+def _rankCrowding(F):
+    N, k = F.shape
+    ranks = np.zeros(N, dtype=int)
+    crowding = np.zeros(N)
+    left = np.arange(N)
+    r = 0
+    while len(left) > 0:
+        front = left[nonDominated(F[left])]
+        ranks[front] = r
+        Ff = F[front]
+        for j in range(k):
+            order = np.argsort(Ff[:, j], kind='mergesort')
+            span = Ff[order[-1], j] - Ff[order[0], j]
+            crowding[front[order[0]]] = float('inf')
+            crowding[front[order[-1]]] = float('inf')
+            if span > 0. and len(front) > 2:
+                crowding[front[order[1:-1]]] += \
+                        (Ff[order[2:], j] - Ff[order[:-2], j]) / span
+        left = left[ranks[left] != r]
+        r += 1
+    return (ranks, crowding)
+
+# returns N x k array of the objectives funcs of the designs in rows of
+# X (H, anchor offset, then any deck parameters). Designs with the same
+# deck (all of them without deck parameters) are form found together 
+# with fromdeck.fromDeckBatch. Deck parameters drawn at random are 
+# rarely repeated, so with them most designs are form found alone. 
+# Designs that fail, do not converge, or have H = 0 get infinite values.
+def _paretoValues(deck, L, q, qArch, segs, funcs, X, makeDeck):
+
+    values = np.empty((len(X), len(funcs)))
+    values.fill(float('inf'))
+
+    if makeDeck is None:
+        groups = [(lambda: deck, np.arange(len(X)))]
+    else:
+        params, inverse = np.unique(X[:, 2:], axis=0, return_inverse=True)
+        groups = []
+        for k in range(len(params)):
+            groups.append((lambda k=k: makeDeck(*params[k]), 
+                           np.nonzero(inverse == k)[0]))
+
+    for make, rows in groups:
+        try:
+            batch = fromdeck.fromDeckBatch(make(), L, X[rows, 1], 
+                                           X[rows, 0], q, qArch, segs)
+        except Exception:
+            continue
+        for j, i in enumerate(rows):
+            if not batch.converged()[j] or X[i, 0] == 0.:
+                continue
+            try:
+                b = batch.bridge(j)
+                values[i] = map(lambda f: f(b), funcs)
+            except Exception:
+                pass
+    values[np.isnan(values)] = float('inf')
+    return values
+
+# Multi-objective optimization function, returns the designs of deck 
+# function deck and parameters L, q, qArch, and segs that are not 
+# dominated for all the built-in optimization input functions named in
+# names (see optDict). The search changes H and anchor offset within 
+# bounds ((Hmin, Hmax), (AOmin, AOmax)) (by default optBounds) with an 
+# evolutionary method that keeps popSize designs for generations 
+# generations and form finds each generation together. If deckParams is
+# given as (makeDeck, paramBounds), makeDeck(*params) returns the deck 
+# function and its parameters are searched within the list of (min, 
+# max) pairs paramBounds too. The search is repeatable for each seed. 
+# Returns dictionary with keys 'columns' (column names), 'table' (array
+# with a row for each Pareto design: H, anchor offset, deck parameters,
+# then the values of names), and 'evaluations'.
+def optPareto(deck, L, q, qArch, segs, names, isArch=True, bounds=None,
+              deckParams=None, popSize=32, generations=30, seed=0,
+              sigArch=1., sigCab=1., h=None):
+
+    if bounds is None:
+        bounds = optBounds(deck, L, q, isArch)
+    bounds = list(bounds)
+    makeDeck = None
+    columns = ['H', 'anchOff']
+    if deckParams is not None:
+        makeDeck, paramBounds = deckParams
+        bounds += list(paramBounds)
+        columns += map(lambda i: 'deck' + str(i), range(len(paramBounds)))
+    lo = np.array(map(lambda b: b[0], bounds), dtype=float)
+    hi = np.array(map(lambda b: b[1], bounds), dtype=float)
+    funcs = map(lambda s: Objective(s, q, qArch, sigArch, sigCab, h), 
+                names)
+    rand = np.random.RandomState(seed)
+    evaluate = lambda X: _paretoValues(deck, L, q, qArch, segs, funcs, X,
+                                       makeDeck)
+
+    X = lo + (hi - lo) * rand.rand(popSize, len(lo))
+    F = evaluate(X)
+    allX = [X]
+    allF = [F]
+
+    for g in range(generations):
+
+        ranks, crowding = _rankCrowding(F)
+
+        # binary tournaments on front then crowding distance
+        a = rand.randint(popSize, size=(popSize, 2))
+        better = (ranks[a[:, 0]] < ranks[a[:, 1]]) | \
+                 ((ranks[a[:, 0]] == ranks[a[:, 1]]) & 
+                  (crowding[a[:, 0]] >= crowding[a[:, 1]]))
+        parents = np.where(better, a[:, 0], a[:, 1])
+
+        # blend pairs of parents and mutate
+        mates = parents[rand.permutation(popSize)]
+        w = rand.rand(popSize, len(lo)) * 1.5 - .25
+        children = X[parents] + w * (X[mates] - X[parents])
+        children += rand.randn(popSize, len(lo)) * (hi - lo) * .02
+        children = np.minimum(np.maximum(children, lo), hi)
+
+        childF = evaluate(children)
+        allX.append(children)
+        allF.append(childF)
+
+        # keep the best popSize of parents and children
+        X = np.vstack((X, children))
+        F = np.vstack((F, childF))
+        ranks, crowding = _rankCrowding(F)
+        keep = np.lexsort((-crowding, ranks))[:popSize]
+        X = X[keep]
+        F = F[keep]
+
+    X = np.vstack(allX)
+    F = np.vstack(allF)
+    finite = np.all(np.isfinite(F), axis=1)
+    X = X[finite]
+    F = F[finite]
+    front = nonDominated(F)
+    table = np.hstack((X[front], F[front]))
+    table = table[np.argsort(table[:, len(lo)], kind='mergesort')]
+    return {'columns': columns + list(names), 'table': table, 
+            'evaluations': len(allX) * popSize}
+
+# writes table of optPareto result d to comma separated file fileName
+def savePareto(d, fileName):
+    np.savetxt(fileName, d['table'], delimiter=',', 
+               header=','.join(d['columns']), comments='')
@@ -1,5 +1,6 @@
 import optimization as opt
 import fromdeck as fd 
+import sweep
 import matplotlib.pyplot as plt
 from bridge import Bridge
 import math
@@ -8,182 +9,95 @@ import math
 units = {'f': '(k)', 'l': '(in)', 'm': '(k-in)', 'fpl': '(k/in)', 
          'a': '(degrees)'}
 
+# plots metric name of sweep result r against its parameter with x-axis
+# label xlabel, where funcName a tuple (func name, func units) and
+# paramName names the parameter in the title
+def plotSweep(r, name, xlabel, funcName, paramName):
+    plt.plot(r[r['param']], r[name])
+    plt.xlabel(xlabel)
+    plt.ylabel(funcName[0] + " " + funcName[1])
+    plt.title(funcName[0] + " as a function of " + paramName)
+    plt.show()
+
 # graph func(bridge) vs. H where funcName a tuple (func name, 
 # func units) and the other arguments are bridge parameters
 def graphFuncH(deck, L, q, qArch, segs, anchOff, funcName, func):
-
-    minH = 5.
-    maxH = 55.
-    steps = 50
-    inc = (maxH - minH)/steps
-    H = minH
-
-    Hs = []
-    results = []
-
-    for i in range(steps):
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        Hs.append(H)
-        results.append(func(bridge))
-        H += inc
-
-    plt.plot(Hs, results)
-    plt.xlabel("horizontal force (H) " + units['f'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of H")
-    plt.show()
+    design = {'deck': deck, 'L': L, 'q': q, 'qArch': qArch, 
+              'segs': segs, 'anchOff': anchOff}
+    r = sweep.sweep('H', sweep.stepValues(5., 55., 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "horizontal force (H) " + units['f'], 
+              funcName, "H")
 
 # graph func(bridge) vs. anchor offset
 def graphFuncAO(deck, L, q, qArch, segs, H, funcName, func):
-
-    minAO = -90.
-    maxAO = 400.
-    steps = 50
-    inc = (maxAO - minAO)/steps
-    anchOff = minAO
-
-    anchOffs = []
-    results = []
-
-    for i in range(steps):
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        anchOffs.append(anchOff)
-        results.append(func(bridge))
-        anchOff += inc
-
-    plt.plot(anchOffs, results)
-    plt.xlabel("anchor offset " + units['l'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of anchor offset")
-    plt.show()
-
-# graph func(bridge) vs. d_deck
+    design = {'deck': deck, 'L': L, 'q': q, 'qArch': qArch, 
+              'segs': segs, 'H': H}
+    r = sweep.sweep('anchOff', sweep.stepValues(-90., 400., 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "anchor offset " + units['l'], funcName, 
+              "anchor offset")
+
+# graph func(bridge) vs. d_deck, where the total load on the deck is Q
+# and the anchor offset is anchOffProp * d_deck
 def graphFuncdDeck(L, Q, qArch, segs, H, anchOffProp, funcName, func):
-
-    mn = 0.
-    mx = 700.
-    steps = 50
-    inc = (mx - mn)/steps
-    d = mn
-
-    ds = []
-    results = []
-
-    for i in range(steps):
-        deck = fd.parabolicDeck(L, d)
-        deckLen = sum(fd.getDeckLengths(deck, L, segs))
-        q = Q / deckLen
-        anchOff = anchOffProp * d
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        ds.append(d)
-        results.append(func(bridge))
-        d += inc
-
-    plt.plot(ds, results)
-    plt.xlabel("Deck depth (d_deck) " + units['l'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of d_deck")
-    plt.show()
+    design = {'L': L, 'Q': Q, 'qArch': qArch, 'segs': segs, 'H': H, 
+              'anchOffProp': anchOffProp}
+    r = sweep.sweep('d', sweep.stepValues(0., 700., 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "Deck depth (d_deck) " + units['l'], 
+              funcName, "d_deck")
+
+# graph func(bridge) vs. amplitude A of a sinusoidal deck with 
+# wavelength lmda and phase phi, where the total load on the deck is Q
+def graphFuncA(L, lmda, phi, Q, qArch, segs, H, anchOff, funcName, func):
+    design = {'L': L, 'lmda': lmda, 'phi': phi, 'Q': Q, 'qArch': qArch,
+              'segs': segs, 'H': H, 'anchOff': anchOff}
+    r = sweep.sweep('A', sweep.stepValues(0., 350., 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "Deck amplitude (A) " + units['l'], 
+              funcName, "A")
 
 # graph func(bridge) vs. h_deck
 def graphFunchDeck(L, d, q, qArch, segs, H, anchOff, funcName, func):
-
-    mn = 0.
-    mx = 500.
-    steps = 50
-    inc = (mx - mn)/steps
-    h = mn
-
-    hs = []
-    results = []
-
-    for i in range(steps):
-        deck = fd.parabolicDeck(L, d, h)
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        hs.append(h)
-        results.append(func(bridge))
-        h += inc
-
-    plt.plot(hs, results)
-    plt.xlabel("Deck height (h_deck) " + units['l'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of h_deck")
-    plt.show()
+    design = {'L': L, 'd': d, 'q': q, 'qArch': qArch, 'segs': segs, 
+              'H': H, 'anchOff': anchOff}
+    r = sweep.sweep('h', sweep.stepValues(0., 500., 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "Deck height (h_deck) " + units['l'], 
+              funcName, "h_deck")
 
 # graph func(bridge) vs. q
 def graphFuncq(deck, L, qArch, segs, H, anchOff, funcName, func):
-
-    mn = 0.05
-    mx = 0.55
-    steps = 50
-    inc = (mx - mn)/steps
-    q = mn
-
-    qs = []
-    results = []
-
-    for i in range(steps):
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        qs.append(q)
-        results.append(func(bridge))
-        q += inc
-
-    plt.plot(qs, results)
-    plt.xlabel("Load on deck (q) " + units['fpl'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of q")
-    plt.show()
+    design = {'deck': deck, 'L': L, 'qArch': qArch, 'segs': segs, 
+              'H': H, 'anchOff': anchOff}
+    r = sweep.sweep('q', sweep.stepValues(.05, .55, 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "Load on deck (q) " + units['fpl'], 
+              funcName, "q")
 
 # graph func(bridge) vs. q_arch
 def graphFuncqArch(deck, L, q, segs, H, anchOff, funcName, func):
-
-    mn = 0.01
-    mx = 0.25
-    steps = 50
-    inc = (mx - mn)/steps
-    qArch = mn
-
-    qs = []
-    results = []
-
-    for i in range(steps):
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        qs.append(qArch)
-        results.append(func(bridge))
-        qArch += inc
-
-    plt.plot(qs, results)
-    plt.xlabel("Self-weight of arch (q_arch) " + units['fpl'])
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of q_arch")
-    plt.show()
+    design = {'deck': deck, 'L': L, 'q': q, 'segs': segs, 'H': H, 
+              'anchOff': anchOff}
+    r = sweep.sweep('qArch', sweep.stepValues(.01, .25, 50), 
+                    {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], 
+              "Self-weight of arch (q_arch) " + units['fpl'], funcName,
+              "q_arch")
 
 # graph func(bridge) vs. segments
 def graphFuncSegs(deck, L, q, qArch, H, anchOff, funcName, func):
+    design = {'deck': deck, 'L': L, 'q': q, 'qArch': qArch, 'H': H, 
+              'anchOff': anchOff}
+    r = sweep.sweep('segs', range(3, 53), {funcName[0]: func}, design)
+    plotSweep(r, funcName[0], "Number of segments", funcName, 
+              "number of segments")
 
-    mn = 3
-    mx = 100
-    steps = 50
-    inc = (mx - mn)/steps
-    segs = mn
-
-    segss = []
-    results = []
-
-    for i in range(steps):
-        bridge = fd.fromDeck(deck, L, anchOff, H, q, qArch, segs)
-        segss.append(segs)
-        results.append(func(bridge))
-        segs += inc
-
-    plt.plot(segss, results)
-    plt.xlabel("Number of segments")
-    plt.ylabel(funcName[0] + " " + funcName[1])
-    plt.title(funcName[0] + " as a function of number of segments")
-    plt.show()
-
-# graph all built-in optimization functions against H and anchor offset
-def graphOptFuncs(deck, L, q, qArch, segs, H, anchOff):
+# graph all built-in optimization functions against H and anchor 
+# offset, each sweep finds all the functions at once and runs in a pool
+# of workers processes
+def graphOptFuncs(deck, L, q, qArch, segs, H, anchOff, workers=1):
 
     names = {'cable force': ("Maximum force in cables", units['f']),
               'arch force': ("Maximum axial force in arch", units['f']),
@@ -197,11 +111,18 @@ def graphOptFuncs(deck, L, q, qArch, segs, H, anchOff):
               'axial force': ("Maximum axial force", units['f']),
               'load path': ("Load path", units['m'])}
 
-    optD = opt.optDict(q, qArch)
-    for n, t in optD.items():
-        if n != 'select arch height':
-            graphFuncH(deck, L, q, qArch, segs, anchOff, names[n], t[0])
-            graphFuncAO(deck, L, q, qArch, segs, H, names[n], t[0])
+    design = {'deck': deck, 'L': L, 'q': q, 'qArch': qArch, 
+              'segs': segs, 'H': H, 'anchOff': anchOff}
+    rH = sweep.sweep('H', sweep.stepValues(5., 55., 50), names.keys(), 
+                     design, workers)
+    rAO = sweep.sweep('anchOff', sweep.stepValues(-90., 400., 50), 
+                      names.keys(), design, workers)
+
+    for n in names.keys():
+        plotSweep(rH, n, "horizontal force (H) " + units['f'], names[n], 
+                  "H")
+        plotSweep(rAO, n, "anchor offset " + units['l'], names[n], 
+                  "anchor offset")
 
 # graph func(bridge) vs. each of the parameters
 def graphParameters(L, d, q, qArch, segs, H, anchOff, funcName, func):
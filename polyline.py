@@ -0,0 +1,119 @@
+import numpy as np
+from vector import Vector
+
+# returns N x 3 float array from coords, which may be a Polyline, a list
+# of Vectors (which are tuples), or any other N x 3 array-like
+def _toArray(coords):
+    if isinstance(coords, Polyline):
+        return coords.array()
+    a = np.array(coords, dtype=float)
+    if a.size == 0:
+        return np.zeros((0, 3))
+    if a.ndim != 2 or a.shape[1] != 3:
+        raise Exception('coordinates must be N x 3')
+    return a
+
+class Polyline:
+
+    # creates Polyline object storing the points in coords as rows of
+    # an N x 3 array, coords can be a list of Vectors or array-like
+    def __init__(self, coords=()):
+        self._a = _toArray(coords)
+
+    # returns Polyline with x, y, and z coordinates from arrays xs, ys,
+    # and zs (scalars are broadcast)
+    @staticmethod
+    def fromXYZ(xs, ys=0., zs=0.):
+        xs = np.asarray(xs, dtype=float)
+        a = np.empty((len(xs), 3))
+        a[:, 0] = xs
+        a[:, 1] = ys
+        a[:, 2] = zs
+        return Polyline(a)
+
+    # returns the N x 3 array of coordinates
+    def array(self):
+        return self._a
+
+    # returns array of x coordinates
+    def xs(self):
+        return self._a[:, 0]
+
+    # returns array of y coordinates
+    def ys(self):
+        return self._a[:, 1]
+
+    # returns array of z coordinates
+    def zs(self):
+        return self._a[:, 2]
+
+    # returns number of points
+    def __len__(self):
+        return len(self._a)
+
+    # returns Vector at index i, or Polyline if i is a slice
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Polyline(self._a[i])
+        x, y, z = self._a[i].tolist()
+        return Vector(x, y, z)
+
+    # yields each point as a Vector
+    def __iter__(self):
+        for x, y, z in self._a.tolist():
+            yield Vector(x, y, z)
+
+    # returns list of Vectors
+    def toVectors(self):
+        return list(self)
+
+    # returns other as an array that can be broadcast against self
+    def _operand(self, other):
+        if isinstance(other, Vector):
+            return np.array(other)
+        return _toArray(other)
+
+    # return pointwise sum of self and that (Polyline or Vector)
+    def __add__(self, that):
+        return Polyline(self._a + self._operand(that))
+
+    # return pointwise difference of self and that (Polyline or Vector)
+    def __sub__(self, that):
+        return Polyline(self._a - self._operand(that))
+
+    # return Polyline that is self scaled by a
+    def __mul__(self, a):
+        return Polyline(self._a * a)
+
+    # return True if self and that have the same points
+    def __eq__(self, that):
+        if that is None:
+            return False
+        try:
+            b = _toArray(that)
+        except Exception:
+            return False
+        return self._a.shape == b.shape and bool(np.all(self._a == b))
+
+    # return True if self and that are not equal
+    def __ne__(self, that):
+        return not(self == that)
+
+    # returns array of lengths of each point treated as a vector
+    def norms(self):
+        return np.sqrt(np.sum(self._a**2, axis=1))
+
+    # returns array of lengths of the segments between points
+    def lengths(self):
+        return np.sqrt(np.sum(np.diff(self._a, axis=0)**2, axis=1))
+
+    # return copy of a polyline that is on the xy-plane shifted to the 
+    # xz-plane
+    def toXZ(self):
+        if np.any(self._a[:, 2] != 0.0):
+            raise Exception(str(self))
+        return Polyline.fromXYZ(self._a[:, 0], 0.0, self._a[:, 1])
+
+    # return a string listing each point as (x, y, z)
+    def __str__(self):
+        return '[' + ', '.join(map(str, self)) + ']'
@@ -0,0 +1,137 @@
+import json
+import os
+import numpy as np
+
+class ResultStore:
+
+    # opens the store of results in directory path, creating it if it
+    # does not exist. Each row has the values of params (design
+    # parameters that identify a design) and metrics. Rows are kept in
+    # memory and written in chunks of chunkSize rows, each column of a
+    # chunk is a .npy file and manifest.json lists the chunks. An
+    # existing store must have the same params and metrics if they are
+    # given.
+    def __init__(self, path, params=None, metrics=None, chunkSize=256):
+
+        self._path = path
+        self._chunkSize = chunkSize
+        manifest = os.path.join(path, 'manifest.json')
+
+        if os.path.exists(manifest):
+            f = open(manifest)
+            try:
+                m = json.load(f)
+            finally:
+                f.close()
+            self._params = map(str, m['params'])
+            self._metrics = map(str, m['metrics'])
+            self._chunks = m['chunks']
+            if params is not None and list(params) != self._params:
+                raise Exception('store has different parameters')
+            if metrics is not None and list(metrics) != self._metrics:
+                raise Exception('store has different metrics')
+        else:
+            if params is None or metrics is None:
+                raise Exception('params and metrics needed for new store')
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            self._params = list(params)
+            self._metrics = list(metrics)
+            self._chunks = []
+            self._writeManifest()
+
+        self._buffer = []
+        self._index = {}
+        if self._chunks:
+            keys = np.column_stack(map(self.column, self._params))
+            for i, key in enumerate(map(tuple, keys.tolist())):
+                self._index[key] = i
+
+    # writes the manifest, replacing the old one only once it is
+    # complete so an interrupted write does not lose the store
+    def _writeManifest(self):
+        manifest = os.path.join(self._path, 'manifest.json')
+        f = open(manifest + '.tmp', 'w')
+        try:
+            json.dump({'params': self._params, 'metrics': self._metrics,
+                       'chunks': self._chunks}, f)
+        finally:
+            f.close()
+        if os.name == 'nt' and os.path.exists(manifest):
+            os.remove(manifest)
+        os.rename(manifest + '.tmp', manifest)
+
+    # returns file name of column j of chunk k
+    def _file(self, k, j):
+        return os.path.join(self._path, 'chunk%05d_%d.npy' % (k, j))
+
+    # returns list of parameter names
+    def params(self):
+        return list(self._params)
+
+    # returns list of metric names
+    def metrics(self):
+        return list(self._metrics)
+
+    # returns list of all column names, parameters then metrics
+    def columns(self):
+        return self._params + self._metrics
+
+    # returns number of rows, written or not
+    def __len__(self):
+        return sum(map(lambda c: c['rows'], self._chunks)) + \
+               len(self._buffer)
+
+    # returns tuple of the values of the parameters of the store in
+    # dictionary design, which identifies the design
+    def key(self, design):
+        return tuple(map(lambda p: float(design[p]), self._params))
+
+    # returns True if the store has a row for key
+    def __contains__(self, key):
+        return key in self._index
+
+    # returns index of the row for key
+    def index(self, key):
+        return self._index[key]
+
+    # adds row, a dictionary with a value for each column (the store 
+    # must not have a row with the same key). Writes a chunk when 
+    # chunkSize rows are waiting.
+    def append(self, row):
+        key = self.key(row)
+        if key in self._index:
+            raise Exception('store already has ' + str(key))
+        self._index[key] = len(self)
+        self._buffer.append(map(lambda c: float(row[c]), self.columns()))
+        if len(self._buffer) >= self._chunkSize:
+            self.flush()
+
+    # writes the waiting rows as a new chunk
+    def flush(self):
+        if not self._buffer:
+            return
+        k = len(self._chunks)
+        a = np.array(self._buffer, dtype=float)
+        for j in range(a.shape[1]):
+            np.save(self._file(k, j), a[:, j])
+        self._chunks.append({'rows': len(a)})
+        self._writeManifest()
+        self._buffer = []
+
+    # returns list of read-only memory-mapped arrays of column name, one
+    # per written chunk
+    def chunks(self, name):
+        j = self.columns().index(name)
+        return map(lambda k: np.load(self._file(k, j), mmap_mode='r'),
+                   range(len(self._chunks)))
+
+    # returns array of column name, including rows not yet written
+    def column(self, name):
+        parts = self.chunks(name)
+        if self._buffer:
+            j = self.columns().index(name)
+            parts.append(np.array(map(lambda r: r[j], self._buffer)))
+        if not parts:
+            return np.zeros(0)
+        return np.concatenate(parts)
@@ -1,26 +1,26 @@
 from vector import Vector
+from polyline import Polyline
 from forcediagram import ForceDiagram 
 from graphicstatics import GraphicStatics 
-from copy import deepcopy
+from graphicstatics import GraphicStaticsCases
+import numpy as np
 
 # creates Vector that with y from vxy and z from vxz
 def _construct(vxy, vxz):
     assert vxy.x() == vxz.x()
     return Vector(vxy.x(), vxy.y(), vxz.z())
 
-# applies _construct to arrays vxys and vxzs
+# applies _construct to Polylines vxys and vxzs
 def _constructArray(vxys, vxzs):
     assert len(vxys) == len(vxzs)
-    a = []
-    for i in range(len(vxys)):
-        a.append(_construct(vxys[i], vxzs[i]))
-    return a
+    assert np.array_equal(vxys.xs(), vxzs.xs())
+    return Polyline.fromXYZ(vxys.xs(), vxys.ys(), vxzs.zs())
 
 class SGSM:
 
     # creates SGSM object that has y-coordinates of GraphicStatics 
     # object gsxy and z-coordinates of GraphicStatics object gsxz 
-    # (gsxz should be in xy-plane, it is translated later)
+    # (gsxz should be in xy-plane, self keeps its xz-plane projection)
     def __init__(self, gsxy, gsxz):
 
         if (not gsxy.isXY()) or (not gsxz.isXY()): 
@@ -31,13 +31,12 @@ class SGSM:
             raise Exception('Mismatched force arrays')
         if gsxy.getL() != gsxz.getL():
             raise Exception('Mismatched lengths')
-        if gsxy.getXs() != gsxz.getXs():
+        if not np.array_equal(gsxy.getXs(), gsxz.getXs()):
             raise Exception('Mismatched xs')
 
         self._gsxy = gsxy
-        self._gsxzInXY = deepcopy(gsxz)
-        gsxz.xytoxz()
-        self._gsxz = gsxz
+        self._gsxzInXY = gsxz
+        self._gsxz = gsxz.toXZ()
         self._formCoords = _constructArray(self._gsxy.getForm(), 
                                            self._gsxz.getForm())  
 
@@ -51,9 +50,7 @@ class SGSM:
 
         FsXY = self._gsxy.getFs()
         FsXZ = self._gsxz.getFs()
-        self._Fs = []
-        for i in range(len(FsXY)):
-            self._Fs.append(Vector(0., FsXY[i], FsXZ[i]))
+        self._Fs = Polyline.fromXYZ(np.zeros(len(FsXY)), FsXY, FsXZ)
 
     # returns GraphicStatics object in xy-plane
     def getGSxy(self):
@@ -98,10 +95,64 @@ class SGSM:
         sign = 1.
         if H > 0.:
             sign = -1.
-        forces = []
-        for v in self._forceDownCoords:
-            forces.append((v - self._o).length() * sign)
-        return forces
-    
+        forces = (self._forceDownCoords - self._o).norms() * sign
+        return forces.tolist()
 
-    
\ No newline at end of file
+class SGSMCases:
+
+    # creates SGSMCases object for length L, cable positions xs, and 
+    # horizontal force H with a load case for each row of the 2-D 
+    # arrays FsXY and FsXZ (applied forces in the xy- and xz-planes). 
+    # The graphic statics of all the cases are solved together.
+    def __init__(self, L, xs, FsXY, FsXZ, H):
+
+        self._gsxy = GraphicStaticsCases(L, xs, FsXY, H)
+        self._gsxz = GraphicStaticsCases(L, xs, FsXZ, H)
+        if self._gsxy.getFs().shape != self._gsxz.getFs().shape:
+            raise Exception('Mismatched force arrays')
+
+    # returns number of load cases
+    def cases(self):
+        return self._gsxy.cases()
+
+    # returns SGSM object of load case k
+    def case(self, k):
+        return SGSM(self._gsxy.case(k), self._gsxz.case(k))
+
+    # returns GraphicStaticsCases object in xy-plane
+    def getGSxy(self):
+        return self._gsxy
+
+    # returns GraphicStaticsCases object representing xz-plane in 
+    # xy-plane
+    def getGSxzInXY(self):
+        return self._gsxz
+
+    # returns 3-D array of form coordinates, one N x 3 array per case
+    def getForms(self):
+        ys = self._gsxy.getFormYs()
+        xs = np.concatenate(([0.], self._gsxy.getXs()))
+        forms = np.empty(ys.shape + (3,))
+        forms[:, :, 0] = xs
+        forms[:, :, 1] = ys
+        forms[:, :, 2] = self._gsxz.getFormYs()
+        return forms
+
+    # returns 2-D array of internal force magnitudes, one row per case,
+    # with the same signs as SGSM.getForces
+    def getForces(self):
+        H = self._gsxy.getH()
+        sign = 1.
+        if H > 0.:
+            sign = -1.
+        dys = self._gsxy.getDownYs() - self._gsxy.getOys()[:, np.newaxis]
+        dzs = self._gsxz.getDownYs() - self._gsxz.getOys()[:, np.newaxis]
+        return np.sqrt(H**2 + dys**2 + dzs**2) * sign
+
+    # returns tuple (R1, R2) of 2-D arrays of the y and z components of 
+    # the reactions at the start and end of the arch, one row per case
+    def getReactions(self):
+        Rxy = self._gsxy.getReactions()
+        Rxz = self._gsxz.getReactions()
+        return (np.column_stack((Rxy[:, 0], Rxz[:, 0])),
+                np.column_stack((Rxy[:, 1], Rxz[:, 1])))
@@ -144,8 +144,11 @@ def main():
             hArch = None
 
         func = opt.optFunc(optParam, q, qArch, h=hArch)
-        bridge = opt.optGlob(deck, L, q, qArch, segs, func, isArch, H, 
+        result = opt.optBrent(deck, L, q, qArch, segs, func, isArch, H, 
                                 anchOff)
+        bridge = result['bridge']
+        if not result['converged']:
+            print "optimization stopped:", result['status']
         
         if H == None:
             print "H =", bridge.getH()
@@ -0,0 +1,329 @@
+import fromdeck
+import optimization
+import numpy as np
+import itertools
+
+# base design of the parameter studies. A design is a dictionary of:
+# 'L', 'H', 'anchOff', 'q', 'qArch', 'segs' - bridge parameters
+# 'deck' - deck function (or its fromdeck.deckKey), if not given the
+#     deck is fromdeck.sineDeck(L, A, lmda, phi, h) when 'A' is given
+#     ('lmda' defaults to L and 'phi' to 0) and otherwise
+#     fromdeck.parabolicDeck(L, d, h)
+# 'Q' - if given, total load on deck, q is Q / (deck length)
+# 'anchOffProp' - if given, anchor offset is anchOffProp * d
+# 'hArch' - arch height used by 'select arch height'
+baseDesign = {'L': 850., 'd': 250., 'h': 0., 'H': 30., 'anchOff': 110.,
+              'q': .15, 'qArch': .0321, 'segs': 50}
+
+# returns deck function of design dictionary design
+def designDeck(design):
+    L = design['L']
+    if 'deck' in design:
+        deck = design['deck']
+        if type(deck) == tuple:
+            deck = fromdeck.deckFromKey(deck)
+        return deck
+    if 'A' in design:
+        return fromdeck.sineDeck(L, design['A'], design.get('lmda', L),
+                                 design.get('phi', 0.), design['h'])
+    return fromdeck.parabolicDeck(L, design['d'], design['h'])
+
+# returns tuple (bridge, q, converged) of the Bridge of design 
+# dictionary design found with fromdeck.fromDeck from start, its load 
+# q, and whether the form finding converged
+def designBridge(design, start=None):
+    deck = designDeck(design)
+    L = design['L']
+    segs = int(design['segs'])
+    q = design['q']
+    if 'Q' in design:
+        q = design['Q'] / sum(fromdeck.getDeckLengths(deck, L, segs))
+    anchOff = design['anchOff']
+    if 'anchOffProp' in design:
+        anchOff = design['anchOffProp'] * design['d']
+    bridge, i, res, converged = fromdeck.fromDeck(deck, L, anchOff, 
+                                                  design['H'], q, 
+                                                  design['qArch'], segs,
+                                                  info=True, start=start)
+    return (bridge, q, converged)
+
+# returns tuple (columns, converged) of a list of arrays of each metric
+# in metrics (list of tuples (name, func)) and an array of whether the
+# form finding converged for the designs of job (design, params, rows),
+# where row i of 2-D array rows has the values of params for design i.
+# Each design starts from the bridge before it. A design whose form 
+# cannot be found gives nan and the next one starts cold, errors in the
+# metrics are raised.
+def _sweepJob(job):
+
+    design, params, rows, metrics = job
+    columns = map(lambda m: np.empty(len(rows)), metrics)
+    converged = np.zeros(len(rows), dtype=bool)
+    bridge = None
+
+    for i in range(len(rows)):
+        d = dict(design)
+        d.update(zip(params, rows[i]))
+        try:
+            bridge, q, converged[i] = designBridge(d, bridge)
+        except Exception:
+            bridge = None
+            converged[i] = False
+            for c in columns:
+                c[i] = float('nan')
+            continue
+        for c, (name, func) in zip(columns, metrics):
+            if func is None:
+                c[i] = bridge.metrics(q, d['qArch'], 
+                                      h=d.get('hArch'))[name]
+            else:
+                c[i] = func(bridge)
+
+    return (columns, converged)
+
+# returns list of tuples (name, func) for metrics as given to sweep,
+# raises if a name is not a built-in optimization input function
+def _metricList(metrics):
+    if type(metrics) == dict:
+        return metrics.items()
+    names = optimization.optList()
+    for name in metrics:
+        if name not in names:
+            raise Exception('unknown metric ' + str(name))
+    return map(lambda name: (name, None), metrics)
+
+# returns design made from baseDesign updated with design, with the 
+# deck replaced by its key if it is to be sent to other processes
+def _fullDesign(design, workers):
+    d = dict(baseDesign)
+    if design is not None:
+        d.update(design)
+    if workers > 1 and 'deck' in d:
+        d['deck'] = fromdeck.deckKey(d['deck'])
+        if type(d['deck']) != tuple:
+            raise Exception("deck cannot be sent to other processes")
+    return d
+
+# returns tuple (columns, converged) of the metrics for the designs in
+# the rows of rows (values of params) solved in chunks of chunkSize, in
+# a pool of workers processes if workers is more than 1. If store (a
+# ResultStore with the metrics and 'converged') is given, designs it 
+# has (or that come earlier in rows) are not solved again, and the 
+# results are added to it as each chunk is done. The store writes them
+# when its own chunk is full and once more at the end.
+def _solveRows(d, params, rows, metrics, workers, chunkSize, store=None):
+
+    designs = []
+    for row in rows:
+        design = dict(d)
+        design.update(zip(params, row))
+        designs.append(design)
+    todo = range(len(rows))
+    if store is not None:
+        keys = set()
+        todo = []
+        for i in range(len(rows)):
+            key = store.key(designs[i])
+            if key not in store and key not in keys:
+                keys.add(key)
+                todo.append(i)
+
+    jobs = []
+    for i in range(0, len(todo), chunkSize):
+        jobs.append((d, params, rows[todo[i:i+chunkSize]], metrics))
+
+    if workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(_sweepJob, jobs)
+    else:
+        results = itertools.imap(_sweepJob, jobs)
+
+    try:
+        done = []
+        for k, (columns, converged) in enumerate(results):
+            done.append((columns, converged))
+            if store is None:
+                continue
+            for n, i in enumerate(todo[k*chunkSize:(k+1)*chunkSize]):
+                row = dict(designs[i])
+                for (name, func), c in zip(metrics, columns):
+                    row[name] = c[n]
+                row['converged'] = converged[n]
+                store.append(row)
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+        if store is not None:
+            store.flush()
+
+    if store is not None:
+        index = map(lambda design: store.index(store.key(design)), 
+                    designs)
+        columns = map(lambda m: store.column(m[0])[index], metrics)
+        converged = store.column('converged')[index] != 0.
+        return (columns, converged)
+
+    if not done:
+        return (map(lambda m: np.zeros(0), metrics), 
+                np.zeros(0, dtype=bool))
+    columns = []
+    for j in range(len(metrics)):
+        columns.append(np.concatenate(map(lambda r: r[0][j], done)))
+    converged = np.concatenate(map(lambda r: r[1], done))
+    return (columns, converged)
+
+# Sweeps design parameter param (a key of a design dictionary, see
+# baseDesign) over values for the design made from baseDesign updated
+# with design. metrics is a list of names of built-in optimization
+# input functions (see optimization.optDict) or a dictionary of names
+# to functions of a Bridge. The values are split into chunks of
+# chunkSize that each run from a cold start, so results do not depend
+# on workers; if workers is more than 1 the chunks run in a pool of that
+# many processes (the deck, if given, must then be made by
+# parabolicDeck or sineDeck, and the functions must be picklable).
+# If store (a resultstore.ResultStore whose metrics are the metric 
+# names and 'converged') is given, results are added to it as chunks 
+# finish and designs it already has are not solved again, so an 
+# interrupted sweep can be resumed. Returns dictionary with key 'param'
+# (param), param (array of values), an array for each metric name (nan
+# where a design failed), and 'converged' (array of whether each form 
+# finding converged).
+def sweep(param, values, metrics, design=None, workers=1, chunkSize=10,
+          store=None):
+
+    d = _fullDesign(design, workers)
+    values = np.asarray(values)
+    metrics = _metricList(metrics)
+    columns, converged = _solveRows(d, (param,), values[:, np.newaxis],
+                                    metrics, workers, chunkSize, store)
+
+    r = {'param': param, param: values, 'converged': converged}
+    for (name, func), c in zip(metrics, columns):
+        r[name] = c
+    return r
+
+# returns True if the cell of sweep2D with corner point indices 
+# corners should be split: a corner failed, or a metric changes across
+# it by more than tol times its range over scales
+def _splitCell(corners, columns, converged, scales, tol):
+    if not np.all(converged[corners]):
+        return True
+    for c, scale in zip(columns, scales):
+        v = c[corners]
+        if v.max() - v.min() > tol * scale:
+            return True
+    return False
+
+# Sweeps design parameters params (two keys of a design dictionary, see
+# sweep) over the box ranges ((min1, max1), (min2, max2)) for the design
+# made from baseDesign updated with design. Starts on an n x n grid and
+# then, levels times, splits each cell into four where a corner design
+# did not converge or a metric changes across the cell by more than tol
+# times its range. metrics, workers, chunkSize, and store are as in 
+# sweep, the new designs of each level are solved together. Returns 
+# dictionary with keys 'params' (params), each of params (array of 
+# values at the points), an array for each metric name, 'converged', 
+# and 'cells' (array with a row of the indices of the corners (min1, 
+# min2), (max1, min2), (min1, max2), (max1, max2) of each cell), which
+# can be used with interpolate2D.
+def sweep2D(params, ranges, metrics, design=None, n=5, levels=3, 
+            tol=.05, workers=1, chunkSize=10, store=None):
+
+    d = _fullDesign(design, workers)
+    metrics = _metricList(metrics)
+    top = 2**levels
+    N = (n - 1) * top
+    lo = np.array(map(lambda r: r[0], ranges), dtype=float)
+    hi = np.array(map(lambda r: r[1], ranges), dtype=float)
+
+    # points are kept by their indices on the finest grid
+    index = {}
+    def corners(cell):
+        i, j, s = cell
+        return [index[(i, j)], index[(i+s, j)], index[(i, j+s)], 
+                index[(i+s, j+s)]]
+    points = []
+    columns = map(lambda m: np.zeros(0), metrics)
+    converged = np.zeros(0, dtype=bool)
+
+    cells = []
+    for i in range(0, N, top):
+        for j in range(0, N, top):
+            cells.append((i, j, top))
+
+    for level in range(levels + 1):
+
+        new = []
+        for i, j, s in cells:
+            for p in ((i, j), (i+s, j), (i, j+s), (i+s, j+s)):
+                if p not in index:
+                    index[p] = len(points) + len(new)
+                    new.append(p)
+        if new:
+            rows = lo + (hi - lo) * np.array(new, dtype=float) / N
+            c, conv = _solveRows(d, params, rows, metrics, workers, 
+                                 chunkSize, store)
+            points += new
+            columns = map(np.append, columns, c)
+            converged = np.append(converged, conv)
+
+        if level == levels:
+            break
+
+        scales = []
+        for c in columns:
+            ok = c[converged]
+            scales.append(ok.max() - ok.min() if len(ok) > 0 else 0.)
+        split = []
+        for cell in cells:
+            if _splitCell(corners(cell), columns, converged, scales, tol):
+                i, j, s = cell
+                h = s / 2
+                split += [(i, j, h), (i+h, j, h), (i, j+h, h), 
+                          (i+h, j+h, h)]
+            else:
+                split.append(cell)
+        cells = split
+
+    values = lo + (hi - lo) * np.array(points, dtype=float) / N
+    r = {'params': tuple(params), 'converged': converged, 
+         'cells': np.array(map(corners, cells))}
+    r[params[0]] = values[:, 0]
+    r[params[1]] = values[:, 1]
+    for (name, func), c in zip(metrics, columns):
+        r[name] = c
+    return r
+
+# returns array of metric name of sweep2D result r at the points with 
+# values xs and ys of its two parameters, interpolated bilinearly in 
+# the cell that holds each point (nan outside the box)
+def interpolate2D(r, name, xs, ys):
+
+    p1, p2 = r['params']
+    xs = np.atleast_1d(np.asarray(xs, dtype=float))
+    ys = np.atleast_1d(np.asarray(ys, dtype=float))
+    cells = r['cells']
+    x0 = r[p1][cells[:, 0]]
+    x1 = r[p1][cells[:, 3]]
+    y0 = r[p2][cells[:, 0]]
+    y1 = r[p2][cells[:, 3]]
+
+    inside = (xs[:, np.newaxis] >= x0) & (xs[:, np.newaxis] <= x1) & \
+             (ys[:, np.newaxis] >= y0) & (ys[:, np.newaxis] <= y1)
+    found = inside.any(axis=1)
+    c = inside.argmax(axis=1)
+    k = cells[c]
+    t = (xs - x0[c]) / (x1[c] - x0[c])
+    u = (ys - y0[c]) / (y1[c] - y0[c])
+
+    v = r[name]
+    result = (v[k[:, 0]] * (1 - t) * (1 - u) + v[k[:, 1]] * t * (1 - u) +
+              v[k[:, 2]] * (1 - t) * u + v[k[:, 3]] * t * u)
+    return np.where(found, result, float('nan'))
+
+# returns array of n equally spaced values from mn up to (but not
+# including) mx, as the parameter studies use
+def stepValues(mn, mx, n):
+    return np.linspace(mn, mx, n, endpoint=False)
@@ -1,11 +1,15 @@
 import openpyxl
+from openpyxl.utils import column_index_from_string
 import fromdeck
 from bridge import Bridge
 import math
 import nonfunicular
-
-# open template Excel spreadsheet
-_wb = openpyxl.load_workbook('sap_template.xlsx')
+import threading
+import io
+import os
+import time
+import traceback
+import itertools
 
 # get column letter from index col
 def _col(col):
@@ -72,361 +76,677 @@ def totalLen(members):
         l += length(m)
     return l
 
+# template workbook used by default
+templateFile = 'sap_template.xlsx'
+
+class Template:
+
+    # reads template workbook in file fileName once. Copies for each 
+    # export are made from its bytes in memory, so they keep the 
+    # template's formatting, and the cell values of its sheets are kept
+    # for lookups and streamed exports, so the template itself is never
+    # changed.
+    def __init__(self, fileName):
+        f = open(fileName, 'rb')
+        try:
+            self._data = f.read()
+        finally:
+            f.close()
+        wb = openpyxl.load_workbook(io.BytesIO(self._data))
+        self._names = wb.sheetnames
+        self._sheets = {}
+        for ws in wb.worksheets:
+            self._sheets[ws.title] = _Values(ws)
+        self._catalog = None
+
+    # returns list of sheet names
+    def sheetnames(self):
+        return list(self._names)
+
+    # returns read-only values of sheet name, indexed like a worksheet
+    # (sheet['A4'].value)
+    def sheet(self, name):
+        return self._sheets[name]
+
+    # returns new workbook that is a copy of the template, formatting
+    # included
+    def copy(self):
+        return openpyxl.load_workbook(io.BytesIO(self._data))
+
+    # returns Catalog of the template's materials and sections, made 
+    # the first time it is asked for
+    def catalog(self):
+        if self._catalog is None:
+            self._catalog = Catalog(self)
+        return self._catalog
+
+class _Values:
+
+    # keeps the cell values of worksheet ws
+    def __init__(self, ws):
+        self._values = {}
+        self._rows = []
+        for row in ws.iter_rows():
+            self._rows.append(tuple(map(lambda c: c.value, row)))
+            for c in row:
+                if c.value is not None:
+                    self._values[c.coordinate] = c.value
+
+    # returns list of tuples of the values of each row, from the first
+    def rows(self):
+        return self._rows
+
+    # returns cell with the value at coordinate ('A4'), None if empty
+    def __getitem__(self, coordinate):
+        return _Cell(self._values.get(coordinate))
+
+class Catalog:
+
+    # reads the materials and the sections of the arch, deck, and cables
+    # from Template template once. Materials come from 'MatProp 02 - 
+    # Basic Mech Props', the frame and cable materials from 'Material 
+    # List 1 - By Obj Type', and the section areas from the first row 
+    # (arch) and second row (deck) of 'Frame Props 01 - General' and the
+    # first row of 'Cable Section Definitions'.
+    def __init__(self, template):
+
+        matProp2 = template.sheet('MatProp 02 - Basic Mech Props')
+        matList1 = template.sheet('Material List 1 - By Obj Type')
+        frameProps01 = template.sheet('Frame Props 01 - General')
+        cableSecDefs = template.sheet('Cable Section Definitions')
+
+        self._materials = {}
+        i = 0
+        while matProp2[_i('A', i)].value not in ('', None):
+            material = matProp2[_i('A', i)].value
+            if material not in self._materials:
+                self._materials[material] = \
+                    (matProp2[_i('B', i)].value, 
+                     matProp2[_i('C', i)].value)
+            i += 1
+
+        frameMat = matList1[_i('B')].value
+        cableMat = matList1[_i('B', 1)].value
+        self._parts = {'arch': (frameMat, frameProps01[_i('J')].value),
+                       'deck': (frameMat, frameProps01[_i('J', 1)].value),
+                       'cable': (cableMat, cableSecDefs[_i('E')].value)}
+
+    # returns list of material names
+    def materials(self):
+        return sorted(self._materials.keys())
+
+    # returns tuple (unit weight, unit mass) of material mat
+    def _material(self, mat):
+        if mat not in self._materials:
+            raise Exception("Materials not consistent")
+        return self._materials[mat]
+
+    # returns tuple (material, section area) of part 'arch', 'deck', or
+    # 'cable'
+    def _part(self, part):
+        if part not in self._parts:
+            raise Exception("invalid input")
+        return self._parts[part]
+
+    # returns material of part
+    def material(self, part):
+        return self._part(part)[0]
+
+    # returns section area of part
+    def area(self, part):
+        return self._part(part)[1]
+
+    # returns unit weight of the material of part
+    def unitWeight(self, part):
+        return self._material(self.material(part))[0]
+
+    # returns unit mass of the material of part
+    def unitMass(self, part):
+        return self._material(self.material(part))[1]
+
+    # returns total weight of part with total length totLen
+    def totalWeight(self, totLen, part):
+        return self.unitWeight(part) * self.area(part) * totLen
+
+    # returns total mass of part with total length totLen
+    def totalMass(self, totLen, part):
+        return self.unitMass(part) * self.area(part) * totLen
+
+class _Cell:
+
+    # holds value of a template cell
+    def __init__(self, value):
+        self.value = value
+
+# yields list of the values of each row of template sheet values (a
+# _Values) with the changes in tables (as in SAPExporter._sheetEdits)
+def _streamRows(values, tables):
+
+    rows = values.rows()
+    last = len(rows)
+    for first, n, func in tables:
+        if n > 0:
+            last = max(last, first + n + 3)
+
+    for r in range(last):
+        row = list(rows[r]) if r < len(rows) else []
+        i = r - 3
+        for first, n, func in tables:
+            if first <= i < first + n:
+                for col, value in func(i - first):
+                    j = column_index_from_string(col) - 1
+                    if j >= len(row):
+                        row += [None] * (j + 1 - len(row))
+                    row[j] = value
+        yield row
+
+# templates loaded so far by file name, loaded when first used
+_templates = {}
+_templatesLock = threading.Lock()
+
+# returns Template of file fileName, which is read only the first time
+def getTemplate(fileName=templateFile):
+    _templatesLock.acquire()
+    try:
+        if fileName not in _templates:
+            _templates[fileName] = Template(fileName)
+        return _templates[fileName]
+    finally:
+        _templatesLock.release()
+
+class SAPExporter:
+
+    # creates exporter that makes SAP spreadsheets from template 
+    # workbook file templateFile in directory directory. Each export 
+    # works on its own copy of the template and only the template is 
+    # shared, so one exporter can be used from several threads, and it
+    # can be sent to other processes, which load the template again.
+    # If stream is True, workbooks are written with streamWorkBook.
+    def __init__(self, templateFile=templateFile, directory='', 
+                 stream=False):
+        self._templateFile = templateFile
+        self._directory = directory
+        self._stream = stream
+
+    # returns Template used by self
+    def template(self):
+        return getTemplate(self._templateFile)
+
+    # returns file name of spreadsheet with file identifier name
+    def fileName(self, name):
+        return os.path.join(self._directory, 'sap_' + name + '.xlsx')
+
+    # returns file name of SGSM results text file with file identifier 
+    # name
+    def gsFileName(self, name):
+        return os.path.join(self._directory, 'gs_' + name + '.txt')
+
+    # returns Catalog of the template's materials and sections
+    def catalog(self):
+        return self.template().catalog()
+
+    # get total weight based on total length totLen and part 'arch', 
+    # 'deck', or 'cable'
+    def totalWeight(self, totLen, part):
+        return self.catalog().totalWeight(totLen, part)
+
+    # get total mass based on total length totLen and part
+    def totalMass(self, totLen, part):
+        return self.catalog().totalMass(totLen, part)
+
+    # returns dictionary of the changes to the template for a workbook
+    # based on members dictionary, joints dictionary, list of cable 
+    # loads cableLoads, and load (q - deck weight). Keys are sheet names
+    # and values are lists of tables (first, rows, func), where func(i)
+    # returns list of (column, value) pairs to write in row first + i
+    # (a row index as in _i). Rows are made only when asked for, so 
+    # the whole model is never held as cells.
+    def _sheetEdits(self, members, joints, segments, cableLoads, load):
+
+        frames = segments * 2
+        cables = len(members) - segments * 2
+        if len(members) != frames + cables:
+            raise Exception()
+
+        deckMem = {i: members[i] for i in range(1, segments + 1)}
+        archMem = {i: members[i] for i in 
+                        range(segments + 1, segments*2 + 1)}
+        cableMem = {i: members[i] for i in 
+                        range(segments*2 + 1, len(members) + 1)}
+
+        deckLen = totalLen(deckMem)
+        archLen = totalLen(archMem)
+        cableLen = totalLen(cableMem)
+
+        deckWeight = self.totalWeight(deckLen, 'deck')
+        archWeight = self.totalWeight(archLen, 'arch')
+        cableWeight = self.totalWeight(cableLen, 'cable')
+
+        deckMass = self.totalMass(deckLen, 'deck')
+        archMass = self.totalMass(archLen, 'arch')
+        cableMass = self.totalMass(cableLen, 'cable')
+
+        frameProps01 = self.template().sheet('Frame Props 01 - General')
+        cableSecDefs = self.template().sheet('Cable Section Definitions')
+
+        cableSec = cableSecDefs[_i('A')].value
+        archRow = 0
+        deckRow = 1
+
+        def cableSecDefsRow(i):
+            return [('J', cableWeight), ('K', cableMass)]
+
+        def frameProps01Row(i):
+            if i == deckRow:
+                return [('Z', deckWeight), ('AA', deckMass)]
+            return [('Z', archWeight), ('AA', archMass)]
+
+        def groups3Row(i):
+            return [('B', deckMass + archMass + cableMass),
+                    ('C', deckWeight + archWeight + cableWeight),
+                    ('D', deckMass + archMass + cableMass),
+                    ('E', deckMass + archMass + cableMass),
+                    ('F', deckMass + archMass + cableMass)]
+
+        restrained = [joints[members[1][0]], 
+                      joints[members[segments][1]],
+                      joints[members[segments + 1][0]],
+                      joints[members[segments * 2][1]]]
+
+        def jointRestraintsRow(i):
+            return [('A', restrained[i]), ('B', 'Yes'), ('C', 'Yes'), 
+                    ('D', 'Yes'), ('E', 'No'), ('F', 'No'), ('G', 'No')]
+
+        def matList1Row(i):
+            if i == 0:
+                return [('C', deckWeight + archWeight), ('D', frames)]
+            return [('C', cableWeight), ('D', cables)]
+
+        def matList2Row(i):
+            return [[('C', segments), ('D', deckLen), ('E', archWeight)],
+                    [('C', segments), ('D', archLen), ('E', deckWeight)],
+                    [('C', cables), ('D', cableLen), 
+                     ('E', cableWeight)]][i]
+
+        def frameConnectRow(i):
+            return [('A', i + 1), 
+                    ('B', joints[members[i+1][0]]),
+                    ('C', joints[members[i+1][1]]),
+                    ('D', 'No'),
+                    ('E', length(members[i+1])),
+                    ('F', centX(members[i+1])),
+                    ('G', centY(members[i+1])),
+                    ('H', centZ(members[i+1]))]
+
+        def frameAutoMeshRow(i):
+            return [('A', i + 1), ('B', 'Yes'), ('C', 'Yes'), ('D', 'No'),
+                    ('E', 0), ('F', 0), ('G', 0)]
+
+        def frameDesignRow(i):
+            return [('A', i + 1), ('B', 'From Material')]
+
+        def frameLoadTransRow(i):
+            return [('A', i + 1), ('B', 'Yes')]
+
+        def frameLoadsRow(i):
+            return [('A', i + 1), ('B', 'DEAD'), ('C', 'GLOBAL'), 
+                    ('D', 'Force'), ('E', 'Gravity'), ('F', 'RelDist'),
+                    ('G', 0), ('H', 1), ('I', 0), 
+                    ('J', length(members[i+1])), ('K', load), 
+                    ('L', load)]
+
+        def frameOutputRow(i):
+            if i < segments:
+                station = [('B', 'MaxStaSpcg'), ('D', 24)]
+            else:
+                station = [('B', 'MinNumSta'), ('C', 3)]
+            return [('A', i + 1)] + station + [('E', 'Yes'), ('F', 'Yes')]
+
+        def frameSecAssignRow(i):
+            if i < segments:
+                row = deckRow    
+            else:
+                row = archRow
+            return [('A', i + 1), 
+                    ('B', frameProps01[_i('C', row)].value),
+                    ('C', 'N.A.'),
+                    ('D', frameProps01[_i('A', row)].value),
+                    ('E', frameProps01[_i('A', row)].value),
+                    ('F', 'Default')]
+
+        def overSteelRow(i):
+            r = [('A', i + 1)]
+            for j in range(1, 45):
+                r.append((_col(j), 0))
+            for c in ['B', 'C', 'V', 'W', 'AF', 'AG']:
+                r.append((c, 'Program Determined'))
+            return r
+
+        def cableOutputRow(i):
+            return [('A', i + frames + 1), ('B', 'MinNumSta'), ('C', 3),
+                    ('E', 'Yes'), ('F', 'Yes')]
+
+        def cableSecAssignRow(i):
+            return [('A', i + frames + 1), ('B', cableSec), 
+                    ('C', 'Default')]
+
+        def cableShapeRow(i):
+            return [('A', i + frames + 1), ('B', 'Tension At I-End'), 
+                    ('C', 1), ('D', cableLoads[i]), ('H', 0),
+                    ('I', length(members[i+frames+1])), ('K', 0), 
+                    ('L', 0), ('M', 'No'), ('N', 'No')]
+
+        def cableConnectRow(i):
+            return [('A', i + frames + 1),
+                    ('B', joints[members[i+frames+1][0]]),
+                    ('C', joints[members[i+frames+1][1]]),
+                    ('D', length(members[i+frames+1]))]
+
+        points = {}
+        for p,n in joints.items():
+            points[n-1] = p
+
+        def jointCoordsRow(i):
+            if i not in points:
+                return []
+            p = points[i]
+            return [('A', i + 1), ('B', 'GLOBAL'), ('C', 'Cartesian'),
+                    ('D', p.x()), ('E', p.y()), ('F', p.z()), ('G', 'No'),
+                    ('H', p.x()), ('I', p.y()), ('J', p.z())]
+
+        jointRows = 0
+        if points:
+            jointRows = max(points.keys()) + 1
+
+        return {
+            'Cable Section Definitions': [(0, 1, cableSecDefsRow)],
+            'Frame Props 01 - General': [(0, 2, frameProps01Row)],
+            'Groups 3 - Masses and Weights': [(0, 1, groups3Row)],
+            'Joint Restraint Assignments': [(0, 4, jointRestraintsRow)],
+            'Material List 1 - By Obj Type': [(0, 2, matList1Row)],
+            'Material List 2 - By Sect Prop': [(0, 3, matList2Row)],
+            'Connectivity - Frame': [(0, frames, frameConnectRow)],
+            'Frame Auto Mesh': [(0, frames, frameAutoMeshRow)],
+            'Frame Design Procedures': [(0, frames, frameDesignRow)],
+            'Frame Load Transfer Options': 
+                [(0, frames, frameLoadTransRow)],
+            'Frame Loads - Distributed': [(0, segments, frameLoadsRow)],
+            'Frame Output Station Assigns': 
+                [(0, frames, frameOutputRow)],
+            'Frame Section Assignments': [(0, frames, frameSecAssignRow)],
+            'Over Steel - AISC 360-10': [(0, frames, overSteelRow)],
+            'Cable Output Station Assigns': [(0, cables, cableOutputRow)],
+            'Cable Section Assignments': [(0, cables, cableSecAssignRow)],
+            'Cable Shape Data': [(0, cables, cableShapeRow)],
+            'Connectivity - Cable': [(0, cables, cableConnectRow)],
+            'Joint Coordinates': [(0, jointRows, jointCoordsRow)]}
+
+    # get Excel workbook based on members dictionary, joints dictionary, 
+    # list of cable loads cableLoads, load (q - deck weight), and file 
+    # identifier name, the workbook is a new copy of the template
+    def getWorkBook(self, members, joints, segments, cableLoads, load, 
+                    name):
+
+        edits = self._sheetEdits(members, joints, segments, cableLoads, 
+                                 load)
+        wb = self.template().copy()
+        for sheet, tables in edits.items():
+            ws = wb.get_sheet_by_name(sheet)
+            for first, rows, func in tables:
+                for i in range(rows):
+                    for col, value in func(i):
+                        ws[_i(col, first + i)] = value
+
+        wb.save(self.fileName(name))
+
+    # get Excel workbook like getWorkBook, but written in openpyxl's 
+    # write-only mode one row at a time, so memory does not grow with 
+    # the number of members. Sheets the export does not change are 
+    # copied from the template's values; the workbook has the same 
+    # values as getWorkBook but not the template's formatting.
+    def streamWorkBook(self, members, joints, segments, cableLoads, load,
+                       name):
+
+        edits = self._sheetEdits(members, joints, segments, cableLoads, 
+                                 load)
+        template = self.template()
+        wb = openpyxl.Workbook(write_only=True)
+        for sheet in template.sheetnames():
+            ws = wb.create_sheet(sheet)
+            for row in _streamRows(template.sheet(sheet), 
+                                   edits.get(sheet, [])):
+                ws.append(row)
+
+        wb.save(self.fileName(name))
+
+    # get unit weight of frames
+    def frameUnitWeight(self):
+        return self.catalog().unitWeight('arch')
+
+    # get Excel spreadsheet from bridge, q, number of cables, and file 
+    # name
+    def toSAP(self, bridge, q, cables, name):
+
+        qDeck = self.frameUnitWeight() * self.catalog().area('deck')
+        load = q - qDeck
+        if load < 0:
+            raise Exception("load must be at least deck weight")
+
+        members = getMembers(bridge, cables)
+        joints = getJoints(bridge)
+        cableForces = bridge.getCableForces(q)
+        segments = bridge.segments()
+        if self._stream:
+            self.streamWorkBook(members, joints, segments, cableForces, 
+                                load, name)
+        else:
+            self.getWorkBook(members, joints, segments, cableForces, 
+                             load, name)
+
+    # get Excel spreadsheet and text file with SGSM results for 
+    # funicular bridge based on typical input parameters, number of 
+    # cables, and file name
+    def toSAPfun(self, deck, L, anchorOffset, H, q, segments, cables, 
+                 name):
+
+        qArch = self.frameUnitWeight() * self.catalog().area('arch')
+        
+        bridge = fromdeck.fromDeck(deck, L, anchorOffset, H, q, qArch, 
+                                    segments)
+        self.toSAP(bridge, q, cables, name)
+
+        cableForces = bridge.getCableForces(q)
+
+        f = open(self.gsFileName(name), "w")
+        forces = bridge.getArchForces()
+        for i in range(segments):
+            f.write(str(segments + i + 1) + "\t" + str(forces[i]) + "\n")
+        for i in range(cables):
+            f.write(str(segments*2 + 1 + i) + "\t" \
+                            + str(cableForces[i]) + "\n")
+        reactions = bridge.getArchReactions(qArch)
+        for i in range(len(reactions)):
+            f.write("R" + str(i+1) + "\t" + str(reactions[i]) + "\n")
+        f.close()
+
+        return bridge
+
+    # get Excel spreadsheet for non-funicular bridge based on arch 
+    # function, deck function, length L, anchor offset, loading q, 
+    # segments, number of cables, and file name
+    def toSAPnonFun(self, arch, deck, L, anchorOffset, q, segments, 
+                    cables, name):
+        bridge = nonfunicular.getBridge(arch, deck, L, segments, 
+                                            anchorOffset)
+        self.toSAP(bridge, q, cables, name)
+        return bridge  
+
+# exporter used by the functions below
+_exporter = SAPExporter()
+
 # get total weight based on total length totLen and part 'arch', 'deck', 
 # or 'cable'
 def totalWeight(totLen, part):
-
-    matProp2 = _wb.get_sheet_by_name('MatProp 02 - Basic Mech Props')
-    matList1 = _wb.get_sheet_by_name('Material List 1 - By Obj Type')
-    frameProps01 = _wb.get_sheet_by_name('Frame Props 01 - General')
-    cableSecDefs = _wb.get_sheet_by_name('Cable Section Definitions')
-
-    if part == 'arch': 
-        mat = matList1[_i('B')].value
-        secArea = frameProps01[_i('J')].value
-    elif part == 'deck':
-        mat = matList1[_i('B')].value
-        secArea = frameProps01[_i('J', 1)].value
-    elif part == 'cable':
-        mat = matList1[_i('B', 1)].value
-        secArea = cableSecDefs[_i('E')].value
-    else: raise Exception("invalid input")
-
-    i = 0
-    material = ""
-    unitWeight = 0
-    while matProp2[_i('A', i)].value != '':
-        material = matProp2[_i('A', i)].value 
-        if material == mat:
-            unitWeight = matProp2[_i('B', i)].value 
-            break
-        i += 1
-
-    if material == "":
-        raise Exception("Materials not consistent")
-
-    return unitWeight * secArea * totLen
+    return _exporter.totalWeight(totLen, part)
 
 # get total mass based on total length totLen and part
 def totalMass(totLen, part):
-
-    matProp2 = _wb.get_sheet_by_name('MatProp 02 - Basic Mech Props')
-    matList1 = _wb.get_sheet_by_name('Material List 1 - By Obj Type')
-    frameProps01 = _wb.get_sheet_by_name('Frame Props 01 - General')
-    cableSecDefs = _wb.get_sheet_by_name('Cable Section Definitions')
-
-    if part == 'arch': 
-        mat = matList1[_i('B')].value
-        secArea = frameProps01[_i('J')].value
-    elif part == 'deck':
-        mat = matList1[_i('B')].value
-        secArea = frameProps01[_i('J', 1)].value
-    elif part == 'cable':
-        mat = matList1[_i('B', 1)].value
-        secArea = cableSecDefs[_i('E')].value
-    else: raise Exception("invalid input")
-
-    i = 0
-    material = ""
-    unitMass = 0
-    while matProp2[_i('A', i)].value != '':
-        material = matProp2[_i('A', i)].value
-        if material == mat:
-            unitMass = matProp2[_i('C', i)].value
-            break
-        i += 1
-
-    if material == "":
-        raise Exception("Materials not consistent")
-
-    return unitMass * secArea * totLen
+    return _exporter.totalMass(totLen, part)
 
 # get Excel workbook based on members dictionary, joints dictionary, 
 # list of cable loads cableLoads, load (q - deck weight), and file 
 # identifier name
 def getWorkBook(members, joints, segments, cableLoads, load, name):
+    _exporter.getWorkBook(members, joints, segments, cableLoads, load, 
+                          name)
 
-    frames = segments * 2
-    cables = len(members) - segments * 2
-    if len(members) != frames + cables:
-        raise Exception()
-
-    deckMem = {i: members[i] for i in range(1, segments + 1)}
-    archMem = {i: members[i] for i in 
-                    range(segments + 1, segments*2 + 1)}
-    cableMem = {i: members[i] for i in 
-                    range(segments*2 + 1, len(members) + 1)}
-
-    deckLen = totalLen(deckMem)
-    archLen = totalLen(archMem)
-    cableLen = totalLen(cableMem)
-
-    deckWeight = totalWeight(deckLen, 'deck')
-    archWeight = totalWeight(archLen, 'arch')
-    cableWeight = totalWeight(cableLen, 'cable')
-
-    deckMass = totalMass(deckLen, 'deck')
-    archMass = totalMass(archLen, 'arch')
-    cableMass = totalMass(cableLen, 'cable')
-
-    frameConnect = _wb.get_sheet_by_name('Connectivity - Frame')
-    cableOutput = _wb.get_sheet_by_name('Cable Output Station Assigns')
-    cableSecAssign = _wb.get_sheet_by_name('Cable Section Assignments')
-    cableSecDefs = _wb.get_sheet_by_name('Cable Section Definitions')
-    cableShape = _wb.get_sheet_by_name('Cable Shape Data')
-    cableConnect = _wb.get_sheet_by_name('Connectivity - Cable')
-    frameAutoMesh = _wb.get_sheet_by_name('Frame Auto Mesh')
-    frameDesign = _wb.get_sheet_by_name('Frame Design Procedures')
-    frameLoadTrans = \
-        _wb.get_sheet_by_name('Frame Load Transfer Options')
-    frameLoads = _wb.get_sheet_by_name('Frame Loads - Distributed')
-    frameOutput = _wb.get_sheet_by_name('Frame Output Station Assigns')
-    frameSecAssign = _wb.get_sheet_by_name('Frame Section Assignments')
-    frameProps01 = _wb.get_sheet_by_name('Frame Props 01 - General')
-    groups3 = _wb.get_sheet_by_name('Groups 3 - Masses and Weights')
-    jointCoords = _wb.get_sheet_by_name('Joint Coordinates')
-    jointRestraints = \
-        _wb.get_sheet_by_name('Joint Restraint Assignments')
-    matList1 = _wb.get_sheet_by_name('Material List 1 - By Obj Type')
-    matList2 = _wb.get_sheet_by_name('Material List 2 - By Sect Prop')
-    overSteel = _wb.get_sheet_by_name('Over Steel - AISC 360-10')
-
-    cableSec = cableSecDefs[_i('A')].value
-    archRow = 0
-    deckRow = 1
-
-    cableSecDefs[_i('J')] = cableWeight
-    cableSecDefs[_i('K')] = cableMass
-
-    frameProps01[_i('Z', deckRow)] = deckWeight
-    frameProps01[_i('AA', deckRow)] = deckMass
-    frameProps01[_i('Z', archRow)] = archWeight
-    frameProps01[_i('AA', archRow)] = archMass
-
-    groups3[_i('B')] = deckMass + archMass + cableMass
-    groups3[_i('C')] = deckWeight + archWeight + cableWeight
-    groups3[_i('D')] = deckMass + archMass + cableMass
-    groups3[_i('E')] = deckMass + archMass + cableMass
-    groups3[_i('F')] = deckMass + archMass + cableMass
-
-    jointRestraints[_i('A', 0)] = joints[members[1][0]]
-    jointRestraints[_i('A', 1)] = joints[members[segments][1]]
-    jointRestraints[_i('A', 2)] = joints[members[segments + 1][0]]
-    jointRestraints[_i('A', 3)] = joints[members[segments * 2][1]]
-
-    for i in range(4):
-        jointRestraints[_i('B', i)] = 'Yes'
-        jointRestraints[_i('C', i)] = 'Yes'
-        jointRestraints[_i('D', i)] = 'Yes'
-        jointRestraints[_i('E', i)] = 'No'
-        jointRestraints[_i('F', i)] = 'No'
-        jointRestraints[_i('G', i)] = 'No'
-
-    matList1[_i('C', 0)] = deckWeight + archWeight
-    matList1[_i('C', 1)] = cableWeight
-    matList1[_i('D', 0)] = frames 
-    matList1[_i('D', 1)] = cables 
-
-    matList2[_i('C', 0)] = segments
-    matList2[_i('C', 1)] = segments
-    matList2[_i('C', 2)] = cables
-    matList2[_i('D', 0)] = deckLen
-    matList2[_i('D', 1)] = archLen
-    matList2[_i('D', 2)] = cableLen
-    matList2[_i('E', 0)] = archWeight
-    matList2[_i('E', 1)] = deckWeight
-    matList2[_i('E', 2)] = cableWeight
-
-    i = 0
-    for i in range(frames):
-
-        frameConnect[_i('A', i)] = i + 1
-        frameConnect[_i('B', i)] = joints[members[i+1][0]]
-        frameConnect[_i('C', i)] = joints[members[i+1][1]]
-        frameConnect[_i('D', i)] = 'No'
-        frameConnect[_i('E', i)] = length(members[i+1])
-        frameConnect[_i('F', i)] = centX(members[i+1])
-        frameConnect[_i('G', i)] = centY(members[i+1])
-        frameConnect[_i('H', i)] = centZ(members[i+1])
-
-        frameAutoMesh[_i('A', i)] = i + 1
-        frameAutoMesh[_i('B', i)] = 'Yes'
-        frameAutoMesh[_i('C', i)] = 'Yes'
-        frameAutoMesh[_i('D', i)] = 'No'
-        frameAutoMesh[_i('E', i)] = 0
-        frameAutoMesh[_i('F', i)] = 0
-        frameAutoMesh[_i('G', i)] = 0
-
-        frameDesign[_i('A', i)] = i + 1
-        frameDesign[_i('B', i)] = 'From Material'
-
-        frameLoadTrans[_i('A', i)] = i + 1
-        frameLoadTrans[_i('B', i)] = 'Yes'
-
-        if i < segments:
-            frameLoads[_i('A', i)] = i + 1
-            frameLoads[_i('B', i)] = 'DEAD'
-            frameLoads[_i('C', i)] = 'GLOBAL'
-            frameLoads[_i('D', i)] = 'Force'
-            frameLoads[_i('E', i)] = 'Gravity'
-            frameLoads[_i('F', i)] = 'RelDist'
-            frameLoads[_i('G', i)] = 0
-            frameLoads[_i('H', i)] = 1
-            frameLoads[_i('I', i)] = 0
-            frameLoads[_i('J', i)] = length(members[i+1])
-            frameLoads[_i('K', i)] = load
-            frameLoads[_i('L', i)] = load
-
-        frameOutput[_i('A', i)] = i + 1
-        if i < segments:
-            frameOutput[_i('B', i)] = 'MaxStaSpcg'
-            frameOutput[_i('D', i)] = 24
-        else:
-            frameOutput[_i('B', i)] = 'MinNumSta'
-            frameOutput[_i('C', i)] = 3
-        frameOutput[_i('E', i)] = 'Yes'
-        frameOutput[_i('F', i)] = 'Yes'
-
-        frameSecAssign[_i('A', i)] = i + 1
-        if i < segments:
-            row = deckRow    
-        else:
-            row = archRow
-        frameSecAssign[_i('B', i)] = frameProps01[_i('C', row)].value
-        frameSecAssign[_i('C', i)] = 'N.A.'
-        frameSecAssign[_i('D', i)] = frameProps01[_i('A', row)].value
-        frameSecAssign[_i('E', i)] = frameProps01[_i('A', row)].value
-        frameSecAssign[_i('F', i)] = 'Default'
-
-        overSteel[_i('A', i)] = i + 1
-        for j in range(1, 45):
-            overSteel[_i(_col(j), i)] = 0
-        for c in ['B', 'C', 'V', 'W', 'AF', 'AG']:
-            overSteel[_i(c, i)] = 'Program Determined'
-
-    i = 0
-    for i in range(cables):
-
-        cableOutput[_i('A', i)] = i + frames + 1
-        cableOutput[_i('B', i)] = 'MinNumSta'
-        cableOutput[_i('C', i)] = 3
-        cableOutput[_i('E', i)] = 'Yes'
-        cableOutput[_i('F', i)] = 'Yes'
-
-        cableSecAssign[_i('A', i)] = i + frames + 1
-        cableSecAssign[_i('B', i)] = cableSec
-        cableSecAssign[_i('C', i)] = 'Default'
-
-        cableShape[_i('A', i)] = i + frames + 1
-        cableShape[_i('B', i)] = 'Tension At I-End'
-        cableShape[_i('C', i)] = 1
-        cableShape[_i('D', i)] = cableLoads[i]
-        cableShape[_i('H', i)] = 0
-        cableShape[_i('I', i)] = length(members[i+frames+1])
-        cableShape[_i('K', i)] = 0
-        cableShape[_i('L', i)] = 0
-        cableShape[_i('M', i)] = 'No'
-        cableShape[_i('N', i)] = 'No'
-
-        cableConnect[_i('A', i)] = i + frames + 1
-        cableConnect[_i('B', i)] = joints[members[i+frames+1][0]]
-        cableConnect[_i('C', i)] = joints[members[i+frames+1][1]]
-        cableConnect[_i('D', i)] = length(members[i+frames+1])
-
-    for p,n in joints.items():
-
-        jointCoords[_i('A', n-1)] = n
-        jointCoords[_i('B', n-1)] = 'GLOBAL'
-        jointCoords[_i('C', n-1)] = 'Cartesian'
-        jointCoords[_i('D', n-1)] = p.x()
-        jointCoords[_i('E', n-1)] = p.y()
-        jointCoords[_i('F', n-1)] = p.z()
-        jointCoords[_i('G', n-1)] = 'No'
-        jointCoords[_i('H', n-1)] = p.x()
-        jointCoords[_i('I', n-1)] = p.y()
-        jointCoords[_i('J', n-1)] = p.z()
-
-    _wb.save('sap_' + name + '.xlsx')
+# get Excel workbook like getWorkBook, streamed one row at a time with
+# the template's values but not its formatting
+def streamWorkBook(members, joints, segments, cableLoads, load, name):
+    _exporter.streamWorkBook(members, joints, segments, cableLoads, load,
+                             name)
 
 # get unit weight of frames
 def frameUnitWeight():
-
-    matProp2 = _wb.get_sheet_by_name('MatProp 02 - Basic Mech Props')
-    matList1 = _wb.get_sheet_by_name('Material List 1 - By Obj Type')
-
-    mat = matList1[_i('B')].value
-    i = 0
-    material = ""
-    unitWeight = 0
-
-    while matProp2[_i('A', i)].value != '' \
-            and matProp2[_i('A', i)].value != None:
-        material = matProp2[_i('A', i)].value 
-        if material == mat:
-            unitWeight = matProp2[_i('B', i)].value 
-            break
-        i += 1
-
-    if material == "":
-        raise Exception("Materials not consistent")
-
-    return unitWeight
+    return _exporter.frameUnitWeight()
 
 # get Excel spreadsheet from bridge, q, number of cables, and file name
 def toSAP(bridge, q, cables, name):
-
-    frameProps01 = _wb.get_sheet_by_name('Frame Props 01 - General')
-    secAreaDeck = frameProps01[_i('J', 1)].value
-    qDeck = frameUnitWeight() * secAreaDeck
-    load = q - qDeck
-    if load < 0:
-        raise Exception("load must be at least deck weight")
-
-    members = getMembers(bridge, cables)
-    joints = getJoints(bridge)
-    cableForces = bridge.getCableForces(q)
-    segments = bridge.segments()
-    getWorkBook(members, joints, segments, cableForces, load, name)
+    _exporter.toSAP(bridge, q, cables, name)
 
 # get Excel spreadsheet and text file with SGSM results for funicular 
 # bridge based on typical input parameters, number of cables, and file 
 # name
 def toSAPfun(deck, L, anchorOffset, H, q, segments, cables, name):
-
-    frameProps01 = _wb.get_sheet_by_name('Frame Props 01 - General')
-    secAreaArch = frameProps01[_i('J')].value
-    qArch = frameUnitWeight() * secAreaArch
-    
-    bridge = fromdeck.fromDeck(deck, L, anchorOffset, H, q, qArch, 
-                                segments)
-    toSAP(bridge, q, cables, name)
-
-    cableForces = bridge.getCableForces(q)
-
-    f = open("gs_" + name + ".txt", "w")
-    forces = bridge.getArchForces()
-    for i in range(segments):
-        f.write(str(segments + i + 1) + "\t" + str(forces[i]) + "\n")
-    for i in range(cables):
-        f.write(str(segments*2 + 1 + i) + "\t" \
-                        + str(cableForces[i]) + "\n")
-    reactions = bridge.getArchReactions(qArch)
-    for i in range(len(reactions)):
-        f.write("R" + str(i+1) + "\t" + str(reactions[i]) + "\n")
-
-    return bridge
+    return _exporter.toSAPfun(deck, L, anchorOffset, H, q, segments, 
+                              cables, name)
 
 # get Excel spreadsheet for non-funicular bridge based on arch function,
 # deck function, length L, anchor offset, loading q, segments, number of 
 # cables, and file name
 def toSAPnonFun(arch, deck, L, anchorOffset, q, segments, cables, name):
-    bridge = nonfunicular.getBridge(arch, deck, L, segments, 
-                                        anchorOffset)
-    toSAP(bridge, q, cables, name)
-    return bridge  
-
-# produce spreadsheets and data files for each bridge in Section 3.1
-def testRanges():
+    return _exporter.toSAPnonFun(arch, deck, L, anchorOffset, q, 
+                                 segments, cables, name)
+
+# returns export job for exportAll that runs toSAPfun with the same 
+# arguments
+def funJob(deck, L, anchorOffset, H, q, segments, cables, name):
+    return ('fun', name, (deck, L, anchorOffset, H, q, segments, cables))
+
+# returns export job for exportAll that runs toSAPnonFun with the same 
+# arguments
+def nonFunJob(arch, deck, L, anchorOffset, q, segments, cables, name):
+    return ('nonfun', name, (arch, deck, L, anchorOffset, q, segments, 
+                             cables))
+
+# returns job with its deck and arch replaced by their keys so it can be
+# sent to other processes
+def _sendableJob(job):
+    kind, name, args = job
+    args = list(args)
+    if kind == 'nonfun':
+        args[0] = nonfunicular.archKey(args[0])
+        if type(args[0]) != tuple:
+            raise Exception("arch cannot be sent to other processes")
+    d = 1 if kind == 'nonfun' else 0
+    args[d] = fromdeck.deckKey(args[d])
+    if type(args[d]) != tuple:
+        raise Exception("deck cannot be sent to other processes")
+    return (kind, name, tuple(args))
+
+# returns list of the output files of job made by exporter
+def _jobFiles(exporter, job):
+    kind, name, args = job
+    files = [exporter.fileName(name)]
+    if kind == 'fun':
+        files.append(exporter.gsFileName(name))
+    return files
+
+# runs export job (exporter, job), returns dictionary with 'name', 
+# 'status' ('done' or 'failed'), 'time' (seconds), and 'error' (the 
+# traceback of a failed job, None otherwise)
+def _exportJob(exporterJob):
+
+    exporter, (kind, name, args) = exporterJob
+    args = list(args)
+    t = time.time()
+    try:
+        if kind == 'fun':
+            if type(args[0]) == tuple:
+                args[0] = fromdeck.deckFromKey(args[0])
+            exporter.toSAPfun(*(args + [name]))
+        else:
+            if type(args[0]) == tuple:
+                args[0] = nonfunicular.archFromKey(args[0])
+            if type(args[1]) == tuple:
+                args[1] = fromdeck.deckFromKey(args[1])
+            exporter.toSAPnonFun(*(args + [name]))
+        status = 'done'
+        error = None
+    except Exception:
+        status = 'failed'
+        error = traceback.format_exc()
+    return {'name': name, 'status': status, 'time': time.time() - t,
+            'error': error}
+
+# runs export jobs jobs (made by funJob and nonFunJob) with exporter 
+# (SAPExporter, default like the module functions), in a pool of 
+# workers processes if workers is more than 1 (decks and arches must 
+# then be made by fromdeck.parabolicDeck, fromdeck.sineDeck, or 
+# nonfunicular.parabolicArch). Jobs whose output files all exist are 
+# skipped if skipExisting is True, and a failed job does not stop the 
+# others. Returns list of a dictionary for each job with 'name', 
+# 'status' ('done', 'skipped', or 'failed'), 'time' (seconds), and 
+# 'error' (traceback of a failed job), printing each as it finishes if 
+# verbose is True.
+def exportAll(jobs, workers=1, exporter=None, skipExisting=True, 
+              verbose=True):
+
+    if exporter is None:
+        exporter = _exporter
+    reports = {}
+    todo = []
+    sent = []
+    for k, job in enumerate(jobs):
+        files = _jobFiles(exporter, job)
+        if skipExisting and all(map(os.path.exists, files)):
+            reports[k] = {'name': job[1], 'status': 'skipped', 'time': 0.,
+                          'error': None}
+            if verbose:
+                print job[1] + ': skipped'
+        else:
+            if workers > 1:
+                job = _sendableJob(job)
+            todo.append(k)
+            sent.append((exporter, job))
+
+    if workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(_exportJob, sent)
+    else:
+        results = itertools.imap(_exportJob, sent)
+
+    try:
+        for k, report in itertools.izip(todo, results):
+            reports[k] = report
+            if verbose and report['status'] == 'done':
+                print '{}: done in {:.2f} s'.format(report['name'], 
+                                                    report['time'])
+            elif verbose:
+                print '{}: failed after {:.2f} s'.format(report['name'], 
+                                                         report['time'])
+                print report['error']
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+
+    return map(lambda k: reports[k], range(len(jobs)))
+
+# produce spreadsheets and data files for each bridge in Section 3.1, 
+# exported by exportAll with workers processes, returns its reports
+def testRanges(workers=1):
 
     mind = 0.
     maxd = 700.
@@ -451,38 +771,43 @@ def testRanges():
     stSegs = 15
     stAO = 110.
 
+    jobs = []
     ao = minAO
     while ao <= maxAO:
-        toSAPfun(fromdeck.parabolicDeck(stL, std), stL, ao, stH, stq, 
-            stSegs, stSegs - 1, "ao=" + str(ao))
+        jobs.append(funJob(fromdeck.parabolicDeck(stL, std), stL, ao, 
+            stH, stq, stSegs, stSegs - 1, "ao=" + str(ao)))
         ao += incAO
 
     d = mind
     while d <= maxd:
-        toSAPfun(fromdeck.parabolicDeck(stL, d), stL, stAO, stH, stq, 
-            stSegs, stSegs - 1, "d=" + str(d))
+        jobs.append(funJob(fromdeck.parabolicDeck(stL, d), stL, stAO, 
+            stH, stq, stSegs, stSegs - 1, "d=" + str(d)))
         d += incd
 
     H = minH
     while H <= maxH:
-        toSAPfun(fromdeck.parabolicDeck(stL, std), stL, stAO, H, stq, 
-            stSegs, stSegs - 1, "H=" + str(H))
+        jobs.append(funJob(fromdeck.parabolicDeck(stL, std), stL, stAO, 
+            H, stq, stSegs, stSegs - 1, "H=" + str(H)))
         H += incH
 
     q = minq
     while q <= maxq:
-        toSAPfun(fromdeck.parabolicDeck(stL, std), stL, stAO, stH, q, 
-            stSegs, stSegs - 1, "q=" + str(q))
+        jobs.append(funJob(fromdeck.parabolicDeck(stL, std), stL, stAO, 
+            stH, q, stSegs, stSegs - 1, "q=" + str(q)))
         q += incq
 
     segs = minSegs
     while segs <= maxSegs:
-        toSAPfun(fromdeck.parabolicDeck(stL, std), stL, stAO, stH, stq, 
-            segs, segs - 1, "segs=" + str(segs))
+        jobs.append(funJob(fromdeck.parabolicDeck(stL, std), stL, stAO, 
+            stH, stq, segs, segs - 1, "segs=" + str(segs)))
         segs += incSegs
 
-# produce spreadsheets for each bridge in Section 3.2
-def testNonFunicular():
+    return exportAll(jobs, workers)
+
+# produce spreadsheets for each bridge in Section 3.2, the non-funicular
+# bridges are exported by exportAll with workers processes, returns its
+# reports
+def testNonFunicular(workers=1):
 
     L = 850.
     deckD = 250.
@@ -501,13 +826,16 @@ def testNonFunicular():
     iterations = 11
     minAngle = max(angleFun - math.pi / 4., math.pi / 8.)
     maxAngle = min(angleFun + math.pi / 4., 7. * math.pi / 8.)
-    incAngle = inc(minAngle, maxAngle, iterations)
+    incAngle = (maxAngle - minAngle) / (iterations - 1)
 
+    jobs = []
     for i in range(iterations):
         angle = minAngle + i * incAngle
         arch = nonfunicular.parabArchPolar(L, angle, r)
         name = 'alt-a={:.2f}'.format(angle * 180. / math.pi)
-        toSAPnonFun(arch, deck, L, ao, q, segs, segs - 1, name)
+        jobs.append(nonFunJob(arch, deck, L, ao, q, segs, segs - 1, name))
+
+    return exportAll(jobs, workers)
 
 if __name__ == '__main__':
     testRanges()
@@ -1,77 +1,94 @@
 import math
 
-class Vector:
+# immutable vector stored as the tuple (x, y, z), so hashing (Vector 
+# can be key in dictionary) comes from tuple. The operators tuple has 
+# are replaced so Vectors never behave like plain tuples.
+class Vector(tuple):
+
+    __slots__ = ()
     
     # create vector object with components x, y, and z
-    def __init__(self, x=0.0, y=0.0, z=0.0):
-        self._x = x
-        self._y = y
-        self._z = z
+    def __new__(cls, x=0.0, y=0.0, z=0.0):
+        return tuple.__new__(cls, (x, y, z))
+
+    # return arguments needed to recreate self when copying or pickling
+    def __getnewargs__(self):
+        return tuple(self)
 
     # return vector sum of self and that
     def __add__(self, that):
-        x = self._x + that.x()
-        y = self._y + that.y()
-        z = self._z + that.z()
-        return Vector(x, y, z)
+        x, y, z = self
+        tx, ty, tz = that
+        return _make((x + tx, y + ty, z + tz))
+
+    # return vector sum of that and self
+    def __radd__(self, that):
+        return self + that
 
     # return vector difference of self and that
     def __sub__(self, that):
-        x = self._x - that.x()
-        y = self._y - that.y()
-        z = self._z - that.z()
-        return Vector(x, y, z)
+        x, y, z = self
+        tx, ty, tz = that
+        return _make((x - tx, y - ty, z - tz))
+
+    # return vector difference of that and self
+    def __rsub__(self, that):
+        x, y, z = self
+        tx, ty, tz = that
+        return _make((tx - x, ty - y, tz - z))
 
     # return vector that is self scaled by a
     def __mul__(self, a):
-        x = self._x * a
-        y = self._y * a
-        z = self._z * a
-        return Vector(x, y, z)
+        if isinstance(a, tuple):
+            raise TypeError('Vector can only be scaled by a number')
+        x, y, z = self
+        return _make((x * a, y * a, z * a))
 
-    # return True if self and that are equal
+    # return vector that is self scaled by a
+    def __rmul__(self, a):
+        return self * a
+
+    # return True if that is a Vector with the same components
     def __eq__(self, that):
-        xeq = self._x == that.x()
-        yeq = self._y == that.y()
-        zeq = self._z == that.z()
-        return xeq and yeq and zeq
+        return isinstance(that, Vector) and tuple.__eq__(self, that)
 
     # return True if self and that are not equal
     def __ne__(self, that):
         return not(self == that)
 
-    # hashing function so Vector can be key in dictionary
-    def __hash__(self):
-        return hash(tuple((self._x, self._y, self._z)))
+    __hash__ = tuple.__hash__
 
     # return magnitude of vector
     def length(self):
-        return math.sqrt(self._x**2 + self._y**2 + self._z**2)
+        x, y, z = self
+        return math.sqrt(x**2 + y**2 + z**2)
 
     # return x component
     def x(self):
-        return self._x
+        return self[0]
 
     # return y component
     def y(self):
-        return self._y
+        return self[1]
 
     # return z component
     def z(self):
-        return self._z
+        return self[2]
 
     # returns y where self intersects line x=vertLine if it starts at 
     # point
     def intersect(self, point, vertLine):
-        assert self._z == 0.0
-        return point.y() + self._y * ((vertLine - point.x()) / self._x)
-
-    # shift a vector that is on the xy-plane to the xz-plane
-    def xytoxz(self):
-        if self._z != 0.0:
+        x, y, z = self
+        assert z == 0.0
+        return point[1] + y * ((vertLine - point[0]) / x)
+
+    # return copy of a vector that is on the xy-plane shifted to the 
+    # xz-plane
+    def toXZ(self):
+        x, y, z = self
+        if z != 0.0:
             raise Exception(str(self))
-        self._z = self._y
-        self._y = 0.0
+        return _make((x, 0.0, y))
 
     # return unit vector with the same direction as self
     def normalize(self):
@@ -80,9 +97,16 @@ class Vector:
     # return a string of form (x, y, z) representing self
     def __str__(self):
         f = '({0}, {1}, {2})'
-        return f.format(self._x, self._y, self._z)
+        return f.format(*self)
+
+    # return a string of form Vector(x, y, z) representing self
+    def __repr__(self):
+        return 'Vector' + str(self)
 
     # return a string representing self that goes to 2 decimal points
     def fstr(self):
         f = '({0:.2f}, {1:.2f}, {2:.2f})'
-        return f.format(self._x, self._y, self._z)
+        return f.format(*self)
+
+# builds a Vector directly from tuple t of components
+_make = lambda t: tuple.__new__(Vector, t)